@@ -0,0 +1,67 @@
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+from src.models import Atom, Bond
+from src.engine import GRID_HEIGHT, GRID_WIDTH
+
+
+@dataclass
+class LegacyAtom:
+    element: str
+    x: int
+    y: int
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    bonds: List[str] = field(default_factory=list)
+
+
+@dataclass
+class LegacyBond:
+    atom_a_id: str
+    atom_b_id: str
+    order: int = 1
+    orientation: str = "H"
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+
+def build_board(atom_cls: Callable, bond_cls: Callable) -> Tuple[Dict, Dict]:
+    atoms: Dict = {}
+    bonds: Dict = {}
+    for y in range(GRID_HEIGHT):
+        previous = None
+        for x in range(GRID_WIDTH):
+            atom = atom_cls(element="C", x=x, y=y)
+            atoms[atom.id] = atom
+            if previous is not None:
+                bond = bond_cls(atom_a_id=previous.id, atom_b_id=atom.id)
+                bonds[bond.id] = bond
+                previous.bonds.append(bond.id)
+                atom.bonds.append(bond.id)
+            previous = atom
+    return atoms, bonds
+
+
+def measure(atom_cls: Callable, bond_cls: Callable) -> Tuple[int, float]:
+    tracemalloc.start()
+    board = build_board(atom_cls, bond_cls)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(10):
+        build_board(atom_cls, bond_cls)
+    build_ms = (time.perf_counter() - start) / 10 * 1000
+    del board
+    return size, build_ms
+
+
+def main() -> None:
+    print(f"{'model':>8} {'KiB':>8} {'build ms':>9}")
+    for name, atom_cls, bond_cls in (("legacy", LegacyAtom, LegacyBond), ("slotted", Atom, Bond)):
+        size, build_ms = measure(atom_cls, bond_cls)
+        print(f"{name:>8} {size / 1024:>8.1f} {build_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
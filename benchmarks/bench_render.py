@@ -0,0 +1,73 @@
+import time
+from typing import Dict, List, Optional
+
+from rich.segment import Segment
+
+from src.engine import Cell
+from src.models import Atom
+from src.puzzles import Difficulty, get_puzzles
+from src.widgets.puzzle_grid import PuzzleGrid
+
+STEPS = (0, 60, 240, 480, 720, 960)
+ROUNDS = 20
+
+
+class LinearScan:
+    def __init__(self, atoms: Dict[int, Atom]) -> None:
+        self.atoms = atoms
+
+    def get(self, cell: Cell) -> Optional[int]:
+        for atom in self.atoms.values():
+            if (atom.x, atom.y) == cell:
+                return atom.id
+        return None
+
+
+class LinearScanGrid(PuzzleGrid):
+    def _render_row(self, y: int, bond_cells: Dict[tuple, str]) -> List[Segment]:
+        board = self.board
+        index, board.atom_index = board.atom_index, LinearScan(board.atoms)
+        try:
+            return super()._render_row(y, bond_cells)
+        finally:
+            board.atom_index = index
+
+
+def fill(grid: PuzzleGrid, count: int) -> None:
+    cells = [(x, y) for y in range(grid.GRID_HEIGHT) for x in range(grid.GRID_WIDTH)]
+    for x, y in cells:
+        if len(grid.board.atoms) >= count:
+            break
+        if (x, y) in grid.board.locked_positions:
+            continue
+        grid.cursor_x = x
+        grid.cursor_y = y
+        grid.add_atom("H")
+
+
+def time_render(grid: PuzzleGrid, invalidate: bool = True) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        if invalidate:
+            grid._invalidate_all()
+        for y in range(grid.GRID_HEIGHT):
+            grid._row_strip(y)
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main() -> None:
+    puzzle = get_puzzles(Difficulty.EASY)[0]
+    print(f"{'atoms':>6} {'indexed ms':>11} {'linear ms':>10} {'idle ms':>8}")
+    for count in STEPS:
+        indexed = PuzzleGrid(puzzle)
+        linear = LinearScanGrid(puzzle)
+        fill(indexed, count)
+        fill(linear, count)
+        print(
+            f"{len(indexed.board.atoms):>6} {time_render(indexed):>11.2f} {time_render(linear):>10.2f}"
+            f" {time_render(indexed, invalidate=False):>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import random
+import time
+from typing import List
+
+from src.puzzles import Difficulty, Puzzle
+from src.scheduler import PuzzleScheduler
+
+SIZES = (1_000, 10_000, 100_000)
+SOLVED_FRACTION = 0.01
+PICKS = 10_000
+LEGACY_PICKS = 3
+
+
+def make_puzzles(count: int) -> List[Puzzle]:
+    return [Puzzle(f"P{i}", "H2", Difficulty.EASY, [], [], []) for i in range(count)]
+
+
+def legacy_pick(puzzles: List[Puzzle], completed: List[str], session_solved: List[str]) -> Puzzle:
+    unsolved = [p for p in puzzles if p.name not in completed and p.name not in session_solved]
+    if not unsolved:
+        unsolved = [p for p in puzzles if p.name not in session_solved]
+    if not unsolved:
+        session_solved.clear()
+        unsolved = list(puzzles)
+    return random.choice(unsolved)
+
+
+def time_legacy(puzzles: List[Puzzle], completed: List[str]) -> float:
+    session_solved: List[str] = []
+    start = time.perf_counter()
+    for _ in range(LEGACY_PICKS):
+        session_solved.append(legacy_pick(puzzles, completed, session_solved).name)
+    return (time.perf_counter() - start) / LEGACY_PICKS * 1e6
+
+
+def time_scheduler(puzzles: List[Puzzle], completed: List[str]) -> float:
+    scheduler = PuzzleScheduler(puzzles, set(completed), rng=random.Random(0))
+    start = time.perf_counter()
+    for n in range(PICKS):
+        puzzle = scheduler.pick()
+        if n % 3:
+            scheduler.mark_solved(puzzle, n % puzzle.time_limit)
+        else:
+            scheduler.mark_failed(puzzle)
+    return (time.perf_counter() - start) / PICKS * 1e6
+
+
+def main() -> None:
+    print(f"{'puzzles':>8} {'solved':>7} {'legacy us/pick':>15} {'sched us/pick':>14}")
+    for size in SIZES:
+        puzzles = make_puzzles(size)
+        completed = [p.name for p in random.Random(size).sample(puzzles, int(size * SOLVED_FRACTION))]
+        print(f"{size:>8} {len(completed):>7} {time_legacy(puzzles, completed):>15.1f} {time_scheduler(puzzles, completed):>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
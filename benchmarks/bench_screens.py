@@ -0,0 +1,73 @@
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List, Optional
+
+from benchmarks.bench_session import FrameClock, summarize
+
+
+async def run(mode: str, puzzles: int) -> dict:
+    from src.app import MoleCraftApp
+    from src.puzzles import Difficulty, get_puzzles
+    from src.screens.game import GameScreen
+
+    catalogue = [p for d in Difficulty for p in get_puzzles(d)]
+    app = MoleCraftApp()
+    samples: List[float] = []
+    memory: List[int] = []
+    async with app.run_test(size=(100, 40)) as pilot:
+        clock = FrameClock(app)
+        await pilot.press("1")
+        await pilot.pause()
+        for n in range(puzzles):
+            puzzle = catalogue[n % len(catalogue)]
+            start = time.perf_counter()
+            if mode == "reuse":
+                app.screen.load_puzzle(puzzle)
+            else:
+                app.pop_screen()
+                app.push_screen(GameScreen(puzzle))
+            await pilot.pause()
+            frame = clock.first_after(start)
+            samples.append(((frame if frame is not None else time.perf_counter()) - start) * 1000)
+            if tracemalloc.is_tracing():
+                gc.collect()
+                memory.append(tracemalloc.get_traced_memory()[0])
+    app.save_writer.close()
+    app.stats.close()
+    result = {"transition_ms": summarize(samples)}
+    if memory:
+        half = len(memory) // 2
+        result["memory_first_half_kib"] = round(sum(memory[:half]) / half / 1024, 1)
+        result["memory_second_half_kib"] = round(sum(memory[half:]) / (len(memory) - half) / 1024, 1)
+        result["growth_per_puzzle_bytes"] = round((memory[-1] - memory[0]) / (len(memory) - 1))
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_screens")
+    parser.add_argument("--puzzles", type=int, default=60)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["MOLECRAFT_HOME"] = home
+        print(f"{'mode':>8} {'p50 ms':>8} {'p95 ms':>8} {'KiB 1st half':>13} {'KiB 2nd half':>13} {'B/puzzle':>9}")
+        for mode in ("new", "reuse"):
+            timing = asyncio.run(run(mode, args.puzzles))
+            tracemalloc.start()
+            mem = asyncio.run(run(mode, args.puzzles))
+            tracemalloc.stop()
+            t = timing["transition_ms"]
+            print(
+                f"{mode:>8} {t['p50']:>8.2f} {t['p95']:>8.2f} {mem['memory_first_half_kib']:>13.1f}"
+                f" {mem['memory_second_half_kib']:>13.1f} {mem['growth_per_puzzle_bytes']:>9}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
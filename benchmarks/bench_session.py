@@ -0,0 +1,181 @@
+import argparse
+import asyncio
+from bisect import bisect_left
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+MOVES = {(0, -1): "up", (0, 1): "down", (-1, 0): "left", (1, 0): "right"}
+ELEMENT_KEYS = {"H": "h", "O": "o", "N": "n", "Cl": "l"}
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": round(ordered[len(ordered) // 2], 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def path_keys(start: Tuple[int, int], end: Tuple[int, int]) -> List[str]:
+    (x, y), (tx, ty) = start, end
+    keys = [MOVES[(1 if tx > x else -1, 0)]] * abs(tx - x)
+    keys += [MOVES[(0, 1 if ty > y else -1)]] * abs(ty - y)
+    return keys
+
+
+def solution_keys(puzzle, cursor: Tuple[int, int]) -> List[str]:
+    keys: List[str] = []
+    for element, x, y in puzzle.target_atoms:
+        keys += path_keys(cursor, (x, y)) + [ELEMENT_KEYS[element]]
+        cursor = (x, y)
+    for a, b, order in puzzle.target_bonds:
+        for _ in range(order):
+            keys += path_keys(cursor, tuple(a)) + ["space"]
+            keys += path_keys(tuple(a), tuple(b)) + ["space"]
+            cursor = tuple(b)
+    return keys
+
+
+class FrameClock:
+    def __init__(self, app) -> None:
+        self.frames: List[float] = []
+        display = app._display
+
+        def timed_display(screen, renderable) -> None:
+            display(screen, renderable)
+            if renderable is not None:
+                self.frames.append(time.perf_counter())
+
+        app._display = timed_display
+
+    def first_after(self, start: float) -> Optional[float]:
+        index = bisect_left(self.frames, start)
+        return self.frames[index] if index < len(self.frames) else None
+
+
+async def run_session(puzzles: int, size: Tuple[int, int], track_memory: bool) -> dict:
+    from src.app import MoleCraftApp
+    from src.screens.game import GameScreen
+    from src.widgets.puzzle_grid import PuzzleGrid
+
+    app = MoleCraftApp()
+    keystrokes: List[float] = []
+    transitions: List[float] = []
+    memory: List[int] = []
+    solved = skipped = 0
+    async with app.run_test(size=size) as pilot:
+        clock = FrameClock(app)
+
+        async def timed(key: str, samples: List[float]) -> None:
+            start = time.perf_counter()
+            await pilot.press(key)
+            frame = clock.first_after(start)
+            samples.append(((frame if frame is not None else time.perf_counter()) - start) * 1000)
+
+        await pilot.pause()
+        await timed("1", transitions)
+        while solved + skipped < puzzles:
+            screen = app.screen
+            if not isinstance(screen, GameScreen):
+                await timed("1", transitions)
+                continue
+            if track_memory:
+                gc.collect()
+                memory.append(tracemalloc.get_traced_memory()[0])
+            grid = screen.query_one(PuzzleGrid)
+            for key in solution_keys(screen.puzzle, (grid.cursor_x, grid.cursor_y)):
+                await timed(key, keystrokes)
+            await timed("enter", transitions)
+            if screen.failures:
+                skipped += 1
+                await timed("escape", transitions)
+            else:
+                solved += 1
+    app.save_writer.close()
+    app.stats.close()
+    result = {
+        "keystroke_ms": summarize(keystrokes),
+        "transition_ms": summarize(transitions),
+        "solved": solved,
+        "skipped": skipped,
+    }
+    if track_memory:
+        growth = [b - a for a, b in zip(memory, memory[1:])]
+        result["memory"] = {
+            "baseline_bytes": memory[0] if memory else 0,
+            "retained_bytes_per_puzzle": round(statistics.fmean(growth)) if growth else 0,
+            "peak_bytes": tracemalloc.get_traced_memory()[1],
+        }
+    return result
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> List[str]:
+    regressions = []
+    for metric in ("keystroke_ms", "transition_ms"):
+        for stat in ("p50", "p95"):
+            old, new = baseline.get(metric, {}).get(stat), result[metric].get(stat)
+            if old and new and new > old * (1 + tolerance):
+                regressions.append(f"{metric}.{stat}: {old} -> {new}")
+    old = baseline.get("memory", {}).get("retained_bytes_per_puzzle")
+    new = result.get("memory", {}).get("retained_bytes_per_puzzle")
+    if old is not None and new is not None and new > max(old, 1024) * (1 + tolerance):
+        regressions.append(f"memory.retained_bytes_per_puzzle: {old} -> {new}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_session")
+    parser.add_argument("--puzzles", type=int, default=10)
+    parser.add_argument("--size", default="100x40", help="terminal size as COLSxROWS")
+    parser.add_argument("--out", type=Path, default=None, help="write the JSON results here")
+    parser.add_argument("--baseline", type=Path, default=None, help="fail if slower than these results")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+    cols, rows = (int(n) for n in args.size.split("x"))
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["MOLECRAFT_HOME"] = home
+        import textual
+
+        timing = asyncio.run(run_session(args.puzzles, (cols, rows), track_memory=False))
+        tracemalloc.start()
+        memory = asyncio.run(run_session(args.puzzles, (cols, rows), track_memory=True))
+        tracemalloc.stop()
+
+    result = {
+        "python": platform.python_version(),
+        "textual": textual.__version__,
+        "terminal": args.size,
+        "puzzles": args.puzzles,
+        **timing,
+        "memory": memory["memory"],
+    }
+    payload = json.dumps(result, indent=2)
+    if args.out is not None:
+        args.out.write_text(payload + "\n", encoding="utf-8")
+    print(payload)
+
+    if args.baseline is not None:
+        regressions = compare(result, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for line in regressions:
+            print(f"regression: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
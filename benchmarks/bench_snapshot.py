@@ -0,0 +1,60 @@
+import json
+import time
+from typing import Tuple
+
+from src.engine import GRID_HEIGHT, GRID_WIDTH, Board
+from src.puzzles import Difficulty, get_puzzles
+from src.snapshot import dump_board, dumps, load_board
+
+ROUNDS = 200
+
+
+def solved(puzzle) -> Board:
+    board = Board(puzzle)
+    for element, x, y in puzzle.target_atoms:
+        board.add_atom(element, x, y)
+    for a, b, order in puzzle.target_bonds:
+        for _ in range(order):
+            board.toggle_select(*a)
+            board.toggle_select(*b)
+    return board
+
+
+def filled(puzzle) -> Board:
+    board = Board(puzzle)
+    for y in range(GRID_HEIGHT):
+        for x in range(GRID_WIDTH):
+            board.add_atom("H", x, y)
+    for y in range(GRID_HEIGHT):
+        for x in range(GRID_WIDTH - 1):
+            board.toggle_select(x, y)
+            board.toggle_select(x + 1, y)
+    return board
+
+
+def round_trip(board: Board) -> Tuple[int, float, float]:
+    text = dumps(dump_board(board, (0, 0)))
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        dumps(dump_board(board, (0, 0)))
+    dump_ms = (time.perf_counter() - start) / ROUNDS * 1000
+    targets = [Board(board.puzzle) for _ in range(ROUNDS)]
+    start = time.perf_counter()
+    for target in targets:
+        load_board(target, json.loads(text))
+    load_ms = (time.perf_counter() - start) / ROUNDS * 1000
+    return len(text), dump_ms, load_ms
+
+
+def main() -> None:
+    print(f"{'board':<18} {'atoms':>6} {'bonds':>6} {'undo':>5} {'bytes':>7} {'dump ms':>8} {'load ms':>8}")
+    boards = [(p.name, solved(p)) for p in get_puzzles(Difficulty.HARD)[:5]]
+    boards.append(("full grid", filled(get_puzzles(Difficulty.EASY)[0])))
+    for label, board in boards:
+        size, dump_ms, load_ms = round_trip(board)
+        undo = len(board.history)
+        print(f"{label:<18} {len(board.atoms):>6} {len(board.bonds):>6} {undo:>5} {size:>7} {dump_ms:>8.3f} {load_ms:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import time
+from typing import Dict, List
+
+from rich.segment import Segment
+from rich.style import Style
+
+from src.puzzles import Difficulty, get_puzzles
+from src.widgets.puzzle_grid import PuzzleGrid
+
+ROUNDS = 200
+
+
+class ParsedStyleGrid(PuzzleGrid):
+    def _render_row(self, y: int, bond_cells: Dict[tuple, str]) -> List[Segment]:
+        segments: List[Segment] = []
+        append = segments.append
+        for x in range(self.GRID_WIDTH):
+            atom = self.board.get_atom_at(x, y)
+            is_cursor = x == self.cursor_x and y == self.cursor_y
+            is_selected = atom is not None and atom.id == self.board.selected_atom_id
+            is_locked = (x, y) in self.board.locked_positions
+            hint_elem = self.board.hint_positions.get((x, y))
+            if atom:
+                ch = atom.element[0]
+                color = self.ELEMENT_COLORS.get(atom.element, "white")
+                if is_selected:
+                    append(Segment(ch, Style.parse(f"bold {color} on dark_green")))
+                elif is_cursor:
+                    append(Segment(ch, Style.parse(f"bold {color} reverse")))
+                elif self.show_open_valence and atom.id in self.board.open_atoms:
+                    append(Segment(ch, Style.parse(f"bold {color} underline on grey23")))
+                elif is_locked:
+                    append(Segment(ch, Style.parse(f"bold {color}")))
+                else:
+                    append(Segment(ch, Style.parse(color)))
+            elif (x, y) in bond_cells:
+                append(Segment(bond_cells[(x, y)], Style.parse("cyan")))
+            elif self.show_hints and hint_elem:
+                ch = hint_elem[0].lower()
+                if is_cursor:
+                    append(Segment(ch, Style.parse("dim bright_magenta reverse")))
+                else:
+                    append(Segment(ch, Style.parse("dim bright_black")))
+            elif is_cursor:
+                append(Segment("◊", Style.parse("bold bright_magenta")))
+            else:
+                append(Segment("·", Style.parse("bright_black")))
+        return segments
+
+
+def build(grid: PuzzleGrid) -> PuzzleGrid:
+    puzzle = grid.puzzle
+    for element, x, y in puzzle.target_atoms:
+        grid.cursor = (x, y)
+        grid.add_atom(element)
+    for a, b, order in puzzle.target_bonds[::2]:
+        for _ in range(order):
+            grid.cursor = a
+            grid.toggle_select()
+            grid.cursor = b
+            grid.toggle_select()
+    grid.cursor = puzzle.carbons[0] if puzzle.carbons else (0, 0)
+    return grid
+
+
+def time_rows(grid: PuzzleGrid) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for y in range(grid.GRID_HEIGHT):
+            grid._render_row(y, grid.board.bond_cells)
+    return (time.perf_counter() - start) / ROUNDS * 1e6
+
+
+def main() -> None:
+    print(f"{'puzzle':<18} {'atoms':>6} {'parsed us':>10} {'table us':>9} {'speedup':>8}")
+    for puzzle in get_puzzles(Difficulty.HARD)[:5]:
+        for highlight in (False, True):
+            parsed = build(ParsedStyleGrid(puzzle))
+            table = build(PuzzleGrid(puzzle))
+            parsed.show_open_valence = table.show_open_valence = highlight
+            before, after = time_rows(parsed), time_rows(table)
+            label = puzzle.name + (" +V" if highlight else "")
+            print(f"{label:<18} {len(table.board.atoms):>6} {before:>10.1f} {after:>9.1f} {before / after:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
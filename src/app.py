@@ -1,13 +1,20 @@
-import random
+import math
+import sys
+import time
+from typing import Dict, Optional
 
 from textual.app import App
 
 from .screens.menu import MenuScreen
 from .screens.game import GameScreen
 from .screens.game_over import GameOverModal
-from .puzzles import Difficulty, get_puzzles, Puzzle, MOLECULE_FACTS
+from .puzzles import Difficulty, find_puzzle, get_puzzles, Puzzle, MOLECULE_FACTS
 from .widgets.puzzle_grid import PuzzleGrid
-from .save_manager import load_save, write_save
+from .profiler import FrameProfiler
+from .scheduler import PROMOTION_MASTERY, PuzzleScheduler, ReviewState
+from .replay import ABANDONED, SOLVED, TIMEOUT, solve_points
+from .save_manager import SaveWriter, StatsStore, append_replay, clear_resume, load_resume, read_save, write_resume
+from .molecule_graph import element_counts, matches_puzzle
 
 
 class MoleCraftApp(App):
@@ -20,38 +27,159 @@ class MoleCraftApp(App):
     """
 
     STARTING_LIVES = 3
+    CLOCK_RESOLUTION = 0.1
 
     def __init__(self) -> None:
         super().__init__()
-        self.save_data = load_save()
+        self.save_data, backlog = read_save()
+        self.save_writer = SaveWriter(backlog=backlog)
+        self.stats = StatsStore()
+        self.stats.import_totals(self.save_data)
+        self.profiler = FrameProfiler.from_env()
         self.score = 0
         self.lives = self.STARTING_LIVES
         self.streak = 0
+        self.session_id = time.time_ns()
         self.current_puzzle: Puzzle | None = None
         self.current_difficulty: Difficulty | None = None
-        self.session_solved: list[str] = []
+        self.game_screen: GameScreen | None = None
+        self.schedulers: Dict[Difficulty, PuzzleScheduler] = {}
+        self.resume_data: Optional[dict] = load_resume()
 
     def on_mount(self) -> None:
+        self.clock_timer = self.set_interval(self.CLOCK_RESOLUTION, self._tick_clock)
         self.push_screen(MenuScreen())
 
+    def _tick_clock(self) -> None:
+        if not self.screen_stack:
+            return
+        screen = self.screen_stack[-1]
+        if isinstance(screen, GameScreen) and screen.is_mounted:
+            screen.tick()
+
+    def _scheduler(self, difficulty: Difficulty) -> PuzzleScheduler:
+        scheduler = self.schedulers.get(difficulty)
+        if scheduler is None:
+            key = difficulty.value
+            scheduler = self.schedulers[difficulty] = PuzzleScheduler(
+                get_puzzles(difficulty),
+                self.save_data["completed_puzzles"].setdefault(key, set()),
+                self.save_data["reviews"].get(key),
+                self.save_data["review_clock"].get(key, 0),
+            )
+        return scheduler
+
+    def _record_review(self, puzzle: Puzzle, state: Optional[ReviewState]) -> None:
+        if state is None:
+            return
+        key = puzzle.difficulty.value
+        self.save_writer.record(
+            self.save_data,
+            "review",
+            difficulty=key,
+            puzzle=puzzle.name,
+            state=state.to_record(),
+            clock=self.schedulers[puzzle.difficulty].clock,
+        )
+
     def _pick_puzzle(self, difficulty: Difficulty) -> Puzzle:
-        puzzles = get_puzzles(difficulty)
-        diff_key = difficulty.value
-        completed = self.save_data["completed_puzzles"].get(diff_key, [])
-        unsolved = [p for p in puzzles if p.name not in completed and p.name not in self.session_solved]
-        if not unsolved:
-            unsolved = [p for p in puzzles if p.name not in self.session_solved]
-        if not unsolved:
-            self.session_solved.clear()
-            unsolved = list(puzzles)
-        return random.choice(unsolved)
+        return self._scheduler(difficulty).pick()
 
     def start_puzzle(self, difficulty: Difficulty) -> None:
+        if self.resume_data is not None:
+            self._discard_resume()
         self.current_difficulty = difficulty
-        self.current_puzzle = self._pick_puzzle(difficulty)
-        self.push_screen(GameScreen(self.current_puzzle))
+        self._show_puzzle(self._pick_puzzle(difficulty))
+
+    def _show_puzzle(self, puzzle: Puzzle, state: Optional[dict] = None) -> None:
+        self.current_puzzle = puzzle
+        if self.game_screen is None:
+            self.game_screen = GameScreen(puzzle, state)
+            self.install_screen(self.game_screen, "game")
+        else:
+            self.game_screen.load_puzzle(puzzle, state)
+        if self.screen is not self.game_screen:
+            self.push_screen(self.game_screen)
+
+    def _resume_target(self, state: dict) -> Optional[Puzzle]:
+        return find_puzzle(state.get("difficulty", ""), state.get("puzzle", ""))
+
+    def suspend_puzzle(self) -> None:
+        screen = self.game_screen
+        screen.pause_clock()
+        self.resume_data = screen.snapshot()
+        self.resume_data.update(
+            score=self.score,
+            lives=self.lives,
+            streak=self.streak,
+            played=self._scheduler(screen.puzzle.difficulty).session_names(),
+        )
+        write_resume(self.resume_data)
+
+    def quit_puzzle(self) -> None:
+        self.suspend_puzzle()
+        self.return_to_menu()
+
+    def resume_puzzle(self) -> None:
+        state, self.resume_data = self.resume_data, None
+        clear_resume()
+        puzzle = self._resume_target(state) if state is not None else None
+        if puzzle is None:
+            self.notify("The saved puzzle no longer exists", severity="warning")
+            return
+        self.score = state.get("score", 0)
+        self.lives = state.get("lives", self.STARTING_LIVES)
+        self.streak = state.get("streak", 0)
+        self.session_id = state.get("replay", {}).get("session", self.session_id)
+        self.current_difficulty = puzzle.difficulty
+        self._scheduler(puzzle.difficulty).restore_session(state.get("played", []))
+        self._show_puzzle(puzzle, state)
+
+    def _discard_resume(self) -> None:
+        state, self.resume_data = self.resume_data, None
+        clear_resume()
+        puzzle = self._resume_target(state)
+        if "replay" in state:
+            append_replay({**state["replay"], "outcome": ABANDONED})
+        if puzzle is not None:
+            self.stats.record_attempt(
+                puzzle.name,
+                puzzle.difficulty.value,
+                False,
+                puzzle.time_limit - max(0, math.ceil(state.get("time_left", 0))),
+                state.get("undo_count", 0),
+                state.get("failures", 0),
+            )
+
+    async def action_quit(self) -> None:
+        if self.game_screen in self.screen_stack and not isinstance(self.screen, GameOverModal):
+            self.suspend_puzzle()
+        await super().action_quit()
+
+    def _finish_run(self, outcome: str) -> None:
+        recorder = self.game_screen.recorder if self.game_screen is not None else None
+        if recorder is not None:
+            append_replay(recorder.to_record(outcome))
+
+    def record_attempt(self, solved: bool) -> None:
+        screen = self.screen
+        if not isinstance(screen, GameScreen):
+            return
+        puzzle = screen.puzzle
+        self.stats.record_attempt(
+            puzzle.name,
+            puzzle.difficulty.value,
+            solved,
+            puzzle.time_limit - screen.time_left,
+            screen.undo_count,
+            screen.failures,
+        )
 
     def lose_life(self, reason: str = "Time's up!") -> None:
+        self.record_attempt(solved=False)
+        self._finish_run(TIMEOUT)
+        puzzle = self.current_puzzle
+        self._record_review(puzzle, self._scheduler(puzzle.difficulty).mark_failed(puzzle))
         self.lives -= 1
         self.streak = 0
         if self.lives <= 0:
@@ -59,14 +187,18 @@ class MoleCraftApp(App):
             self.push_screen(GameOverModal(self.score, self.save_data["high_score"], reason))
         else:
             self.notify(f"{reason} {self.lives} {'lives' if self.lives > 1 else 'life'} left", severity="warning")
-            self.pop_screen()
             self.start_puzzle(self.current_difficulty)
 
+    def _reset_sessions(self) -> None:
+        for scheduler in self.schedulers.values():
+            scheduler.reset_session()
+
     def restart_game(self) -> None:
         self.score = 0
+        self.session_id = time.time_ns()
         self.lives = self.STARTING_LIVES
         self.streak = 0
-        self.session_solved.clear()
+        self._reset_sessions()
         while len(self.screen_stack) > 1:
             self.pop_screen()
         self.start_puzzle(self.current_difficulty)
@@ -74,43 +206,38 @@ class MoleCraftApp(App):
     def return_to_menu(self) -> None:
         self._save_high_score()
         self.score = 0
+        self.session_id = time.time_ns()
         self.lives = self.STARTING_LIVES
         self.streak = 0
-        self.session_solved.clear()
+        self._reset_sessions()
         while len(self.screen_stack) > 1:
             self.pop_screen()
         self.push_screen(MenuScreen())
 
     def _record_solve(self, puzzle: Puzzle, time_remaining: int) -> None:
-        diff_key = self.current_difficulty.value
-        completed = self.save_data["completed_puzzles"]
-        if puzzle.name not in completed[diff_key]:
-            completed[diff_key].append(puzzle.name)
-        self.save_data["total_solved"] = self.save_data.get("total_solved", 0) + 1
-        solve_time = puzzle.time_limit - time_remaining
-        fastest = self.save_data.get("fastest_solve")
-        if fastest is None or solve_time < fastest:
-            self.save_data["fastest_solve"] = solve_time
-        if self.streak > self.save_data.get("best_streak", 0):
-            self.save_data["best_streak"] = self.streak
+        self.save_writer.record(
+            self.save_data,
+            "solve",
+            difficulty=self.current_difficulty.value,
+            puzzle=puzzle.name,
+            solve_time=puzzle.time_limit - time_remaining,
+            streak=self.streak,
+        )
         self._save_high_score()
 
     def _save_high_score(self) -> None:
-        if self.score > self.save_data["high_score"]:
-            self.save_data["high_score"] = self.score
-        self.save_data["last_difficulty"] = self.current_difficulty.value if self.current_difficulty else "easy"
-        write_save(self.save_data)
+        difficulty = self.current_difficulty.value if self.current_difficulty else "easy"
+        if self.score > self.save_data["high_score"] or difficulty != self.save_data["last_difficulty"]:
+            self.save_writer.record(self.save_data, "session", score=self.score, difficulty=difficulty)
 
     def _check_promotion(self) -> Difficulty:
         diff_key = self.current_difficulty.value
-        completed = self.save_data["completed_puzzles"].get(diff_key, [])
-        all_puzzles = get_puzzles(self.current_difficulty)
-        if len(completed) >= len(all_puzzles):
+        if self._scheduler(self.current_difficulty).mastery >= PROMOTION_MASTERY:
             next_map = {Difficulty.EASY: Difficulty.MEDIUM, Difficulty.MEDIUM: Difficulty.HARD}
             if self.current_difficulty in next_map:
                 promoted = next_map[self.current_difficulty]
                 self.notify(
-                    f"All {diff_key} puzzles cleared! Moving to {promoted.value}",
+                    f"{diff_key.capitalize()} puzzles mastered! Moving to {promoted.value}",
                     severity="information",
                     timeout=5,
                 )
@@ -119,39 +246,17 @@ class MoleCraftApp(App):
         return self.current_difficulty
 
     def check_solution(self, grid: PuzzleGrid) -> None:
-        player_atoms = set()
-        for atom in grid.atoms.values():
-            if (atom.x, atom.y) not in grid.locked_positions:
-                player_atoms.add((atom.element, atom.x, atom.y))
-
-        target_atoms = set()
-        for elem, x, y in self.current_puzzle.target_atoms:
-            if elem != "C":
-                target_atoms.add((elem, x, y))
-
-        player_bonds = set()
-        for bond in grid.bonds.values():
-            a = grid.atoms.get(bond.atom_a_id)
-            b = grid.atoms.get(bond.atom_b_id)
-            if a and b:
-                key = tuple(sorted([(a.x, a.y), (b.x, b.y)]))
-                player_bonds.add((key, bond.order))
-
-        target_bonds = set()
-        for (x1, y1), (x2, y2), order in self.current_puzzle.target_bonds:
-            key = tuple(sorted([(x1, y1), (x2, y2)]))
-            target_bonds.add((key, order))
-
-        atoms_correct = player_atoms == target_atoms
-        bonds_correct = player_bonds == target_bonds
-
-        if atoms_correct and bonds_correct:
-            time_bonus = self.screen.time_left * 10
+        puzzle = self.current_puzzle
+        board = grid.board
+        if matches_puzzle(board.atoms.values(), board.bonds.values(), puzzle):
+            self.screen.pause_clock()
             self.streak += 1
-            streak_bonus = (self.streak - 1) * 25
-            gained = 100 + time_bonus + streak_bonus
+            gained = solve_points(self.screen.time_left, self.streak)
             self.score += gained
-            self.session_solved.append(self.current_puzzle.name)
+            state = self._scheduler(puzzle.difficulty).mark_solved(
+                puzzle, puzzle.time_limit - self.screen.time_left, self.screen.failures
+            )
+            self._record_review(puzzle, state)
             parts = [f"+{gained} pts"]
             if self.streak > 1:
                 parts.append(f"streak x{self.streak}")
@@ -159,24 +264,39 @@ class MoleCraftApp(App):
             fact = MOLECULE_FACTS.get(self.current_puzzle.name)
             if fact:
                 self.notify(fact, severity="information", timeout=6)
+            self.record_attempt(solved=True)
+            self._finish_run(SOLVED)
             self._record_solve(self.current_puzzle, self.screen.time_left)
             next_diff = self._check_promotion()
-            self.pop_screen()
             self.start_puzzle(next_diff)
         else:
-            missing_atoms = target_atoms - player_atoms
-            extra_atoms = player_atoms - target_atoms
-            if missing_atoms:
+            self.screen.failures += 1
+            player_counts = element_counts(board.atoms.values())
+            if puzzle.element_counts - player_counts:
                 self.notify("Missing atoms!", severity="error")
-            elif extra_atoms:
+            elif player_counts - puzzle.element_counts:
                 self.notify("Extra atoms!", severity="error")
-            elif not bonds_correct:
+            else:
                 self.notify("Bonds incorrect!", severity="error")
 
 
 def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == "validate":
+        from .validate import main as validate_main
+
+        sys.exit(validate_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "replay":
+        from .replay import main as replay_main
+
+        sys.exit(replay_main(sys.argv[2:]))
     app = MoleCraftApp()
-    app.run()
+    try:
+        app.run()
+    finally:
+        app.save_writer.close()
+        app.stats.close()
+        if app.profiler is not None:
+            app.profiler.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,77 @@
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+CATALOGUE_DIR = Path(__file__).parent / "data" / "puzzles"
+DIFFICULTIES = ("easy", "medium", "hard")
+
+_FIELDS = {
+    "name": str,
+    "formula": str,
+    "carbons": list,
+    "target_atoms": list,
+    "target_bonds": list,
+    "hint": str,
+    "time_limit": int,
+}
+
+
+def pack_path(difficulty: str, directory: Path = CATALOGUE_DIR) -> Path:
+    return directory / f"{difficulty}.json"
+
+
+def read_pack(difficulty: str, directory: Path = CATALOGUE_DIR) -> List[dict]:
+    return json.loads(pack_path(difficulty, directory).read_text(encoding="utf-8"))
+
+
+def write_pack(difficulty: str, records: List[dict], directory: Path = CATALOGUE_DIR) -> None:
+    lines = [json.dumps(record, separators=(",", ":"), ensure_ascii=False) for record in records]
+    pack_path(difficulty, directory).write_text("[\n" + ",\n".join(lines) + "\n]\n", encoding="utf-8")
+
+
+def check_record(record: dict) -> List[str]:
+    errors = []
+    for key, kind in _FIELDS.items():
+        if not isinstance(record.get(key), kind):
+            errors.append(f"{key} missing or not {kind.__name__}")
+    if errors:
+        return errors
+    positions = {tuple(pos) for pos in record["carbons"]}
+    for atom in record["target_atoms"]:
+        if len(atom) != 3 or not isinstance(atom[0], str):
+            errors.append(f"bad target atom {atom}")
+            continue
+        positions.add((atom[1], atom[2]))
+    for bond in record["target_bonds"]:
+        if len(bond) != 3:
+            errors.append(f"bad target bond {bond}")
+            continue
+        a, b, order = bond
+        if tuple(a) not in positions or tuple(b) not in positions:
+            errors.append(f"bond {bond} references an empty cell")
+        if order not in (1, 2, 3):
+            errors.append(f"bond {bond} has order {order}")
+    return errors
+
+
+def build() -> int:
+    failures = 0
+    for difficulty in DIFFICULTIES:
+        records = read_pack(difficulty)
+        names = set()
+        for record in records:
+            errors = check_record(record)
+            if record.get("name") in names:
+                errors.append("duplicate name")
+            names.add(record.get("name"))
+            for error in errors:
+                print(f"{difficulty}/{record.get('name', '?')}: {error}", file=sys.stderr)
+            failures += bool(errors)
+        write_pack(difficulty, records)
+        print(f"{difficulty}: {len(records)} puzzles")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(build())
@@ -0,0 +1,384 @@
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .history import ATOM_ADD, ATOM_REMOVE, BOND_ADD, BOND_ORDER, BOND_REMOVE, Edit, EditHistory, Entry
+from .models import Atom, Bond
+from .puzzles import Puzzle
+
+GRID_WIDTH = 60
+GRID_HEIGHT = 16
+
+MAX_VALENCY = {
+    "C": 4,
+    "N": 3,
+    "O": 2,
+    "H": 1,
+    "Cl": 1,
+}
+
+BOND_CHARS = {1: ("─", "│"), 2: ("═", "║"), 3: ("≡", "┃")}
+
+Cell = Tuple[int, int]
+
+
+def step_cursor(cursor: Cell, dx: int, dy: int) -> Cell:
+    x, y = cursor
+    if 0 <= x + dx < GRID_WIDTH:
+        x += dx
+    if 0 <= y + dy < GRID_HEIGHT:
+        y += dy
+    return x, y
+
+
+class Board:
+    def __init__(
+        self,
+        puzzle: Puzzle,
+        max_undo: Optional[int] = None,
+        on_change: Optional[Callable[[Iterable[int]], None]] = None,
+    ) -> None:
+        self.puzzle = puzzle
+        self.atoms: Dict[int, Atom] = {}
+        self.bonds: Dict[int, Bond] = {}
+        self.atom_index: Dict[Cell, int] = {}
+        self._bond_index: Dict[frozenset, int] = {}
+        self._cell_bonds: Dict[Cell, List[int]] = {}
+        self.bond_cells: Dict[Cell, str] = {}
+        self.selected_atom_id: Optional[int] = None
+        self.locked_positions: Set[Cell] = set()
+        self.hint_positions: Dict[Cell, str] = {}
+        self.open_atoms: Set[int] = set()
+        self.history = EditHistory(max_undo)
+        self.revision = 0
+        self.on_change = on_change
+        self._setup_puzzle()
+
+    def _setup_puzzle(self, place_carbons: bool = True) -> None:
+        self.hint_positions.clear()
+        for x, y in self.puzzle.carbons:
+            if place_carbons:
+                self._place_atom(Atom(element="C", x=x, y=y))
+            self.locked_positions.add((x, y))
+        for elem, x, y in self.puzzle.target_atoms:
+            if elem == "C":
+                continue
+            self.hint_positions[(x, y)] = elem
+
+    def _changed(self, rows: Iterable[int]) -> None:
+        if self.on_change is not None:
+            self.on_change(rows)
+
+    def _changed_all(self) -> None:
+        self._changed(range(GRID_HEIGHT))
+
+    def _place_atom(self, atom: Atom) -> None:
+        self.atoms[atom.id] = atom
+        self.atom_index[(atom.x, atom.y)] = atom.id
+        self._track_valence(atom)
+
+    def _drop_atom(self, atom: Atom) -> None:
+        self.atoms.pop(atom.id)
+        self.atom_index.pop((atom.x, atom.y), None)
+        self.open_atoms.discard(atom.id)
+
+    def _track_valence(self, atom: Atom) -> None:
+        if atom.used_valence < MAX_VALENCY.get(atom.element, 4):
+            self.open_atoms.add(atom.id)
+        else:
+            self.open_atoms.discard(atom.id)
+
+    def _add_valence(self, bond: Bond, delta: int) -> None:
+        for atom_id in (bond.atom_a_id, bond.atom_b_id):
+            atom = self.atoms.get(atom_id)
+            if atom is not None:
+                atom.used_valence += delta
+                self._track_valence(atom)
+
+    def _bond_rows(self, bond: Bond) -> range:
+        a = self.atoms.get(bond.atom_a_id)
+        b = self.atoms.get(bond.atom_b_id)
+        if not a or not b:
+            return range(0)
+        return range(min(a.y, b.y), max(a.y, b.y) + 1)
+
+    def selection_rows(self) -> Tuple[int, ...]:
+        selected = self.atoms.get(self.selected_atom_id) if self.selected_atom_id is not None else None
+        return (selected.y,) if selected else ()
+
+    def _bond_path(self, bond: Bond) -> List[Cell]:
+        a = self.atoms.get(bond.atom_a_id)
+        b = self.atoms.get(bond.atom_b_id)
+        if not a or not b:
+            return []
+        if bond.orientation == "H":
+            x1, x2 = min(a.x, b.x), max(a.x, b.x)
+            return [(x, a.y) for x in range(x1 + 1, x2)]
+        y1, y2 = min(a.y, b.y), max(a.y, b.y)
+        return [(a.x, y) for y in range(y1 + 1, y2)]
+
+    def _bond_glyph(self, bond: Bond) -> str:
+        h_char, v_char = BOND_CHARS.get(bond.order, ("─", "│"))
+        return h_char if bond.orientation == "H" else v_char
+
+    def _paint_cell(self, cell: Cell) -> None:
+        stack = self._cell_bonds.get(cell)
+        if stack:
+            self.bond_cells[cell] = self._bond_glyph(self.bonds[stack[-1]])
+        else:
+            self._cell_bonds.pop(cell, None)
+            self.bond_cells.pop(cell, None)
+
+    def _index_bond(self, bond: Bond) -> None:
+        self._bond_index[frozenset((bond.atom_a_id, bond.atom_b_id))] = bond.id
+        for cell in self._bond_path(bond):
+            self._cell_bonds.setdefault(cell, []).append(bond.id)
+            self._paint_cell(cell)
+
+    def _unindex_bond(self, bond: Bond) -> None:
+        self._bond_index.pop(frozenset((bond.atom_a_id, bond.atom_b_id)), None)
+        for cell in self._bond_path(bond):
+            stack = self._cell_bonds.get(cell)
+            if stack and bond.id in stack:
+                stack.remove(bond.id)
+            self._paint_cell(cell)
+
+    def reset(self) -> None:
+        self._clear()
+        self._setup_puzzle()
+        self._changed_all()
+
+    def load_puzzle(self, puzzle: Puzzle) -> None:
+        self.puzzle = puzzle
+        self.reset()
+
+    def _clear(self) -> None:
+        self.atoms.clear()
+        self.bonds.clear()
+        self.atom_index.clear()
+        self._bond_index.clear()
+        self._cell_bonds.clear()
+        self.bond_cells.clear()
+        self.open_atoms.clear()
+        self.locked_positions.clear()
+        self.selected_atom_id = None
+        self.history.clear()
+        self.revision += 1
+
+    def load_state(
+        self,
+        atoms: List[Atom],
+        bonds: List[Bond],
+        undo: List[Entry],
+        redo: List[Entry],
+        decode: Callable[[list], Edit],
+        selected: Optional[int],
+    ) -> None:
+        self._clear()
+        self._setup_puzzle(place_carbons=False)
+        for atom in atoms:
+            atom.bonds.clear()
+            atom.used_valence = 0
+            self.atoms[atom.id] = atom
+            self.atom_index[(atom.x, atom.y)] = atom.id
+        for bond in bonds:
+            self.bonds[bond.id] = bond
+            a, b = self.atoms[bond.atom_a_id], self.atoms[bond.atom_b_id]
+            a.bonds.append(bond.id)
+            b.bonds.append(bond.id)
+            a.used_valence += bond.order
+            b.used_valence += bond.order
+            self._index_bond(bond)
+        for atom in atoms:
+            self._track_valence(atom)
+        self.history.load(undo, redo, decode)
+        self.selected_atom_id = selected
+        self._changed_all()
+
+    def _attach_atom(self, atom: Atom) -> None:
+        self.revision += 1
+        self._place_atom(atom)
+        self._changed((atom.y,))
+        self.history.record((ATOM_ADD, atom))
+
+    def _detach_atom(self, atom: Atom) -> None:
+        self.revision += 1
+        self._drop_atom(atom)
+        self._changed((atom.y,))
+        self.history.record((ATOM_REMOVE, atom))
+
+    def _attach_bond(self, bond: Bond) -> None:
+        self.revision += 1
+        self.bonds[bond.id] = bond
+        self.atoms[bond.atom_a_id].bonds.append(bond.id)
+        self.atoms[bond.atom_b_id].bonds.append(bond.id)
+        self._add_valence(bond, bond.order)
+        self._index_bond(bond)
+        self._changed(self._bond_rows(bond))
+        self.history.record((BOND_ADD, bond, bond.order))
+
+    def _detach_bond(self, bond: Bond) -> None:
+        self.revision += 1
+        self._changed(self._bond_rows(bond))
+        self._unindex_bond(bond)
+        if bond.atom_a_id in self.atoms:
+            a = self.atoms[bond.atom_a_id]
+            if bond.id in a.bonds:
+                a.bonds.remove(bond.id)
+        if bond.atom_b_id in self.atoms:
+            b = self.atoms[bond.atom_b_id]
+            if bond.id in b.bonds:
+                b.bonds.remove(bond.id)
+        del self.bonds[bond.id]
+        self._add_valence(bond, -bond.order)
+        self.history.record((BOND_REMOVE, bond, bond.order))
+
+    def _set_bond_order(self, bond: Bond, order: int) -> None:
+        self.revision += 1
+        previous = bond.order
+        bond.order = order
+        self._add_valence(bond, order - previous)
+        for cell in self._bond_path(bond):
+            self._paint_cell(cell)
+        self._changed(self._bond_rows(bond))
+        self.history.record((BOND_ORDER, bond, previous, order))
+
+    def _revert(self, op: tuple) -> None:
+        kind, target = op[0], op[1]
+        if kind == ATOM_ADD:
+            self._detach_atom(target)
+        elif kind == ATOM_REMOVE:
+            self._attach_atom(target)
+        elif kind == BOND_ADD:
+            self._detach_bond(target)
+        elif kind == BOND_REMOVE:
+            target.order = op[2]
+            self._attach_bond(target)
+        elif kind == BOND_ORDER:
+            self._set_bond_order(target, op[2])
+
+    def _replay(self, op: tuple) -> None:
+        kind, target = op[0], op[1]
+        if kind == ATOM_ADD:
+            self._attach_atom(target)
+        elif kind == ATOM_REMOVE:
+            self._detach_atom(target)
+        elif kind == BOND_ADD:
+            target.order = op[2]
+            self._attach_bond(target)
+        elif kind == BOND_REMOVE:
+            self._detach_bond(target)
+        elif kind == BOND_ORDER:
+            self._set_bond_order(target, op[3])
+
+    def _restore_selection(self, selected: Optional[int]) -> None:
+        self._changed(self.selection_rows())
+        self.selected_atom_id = selected
+        self._changed(self.selection_rows())
+
+    def undo(self) -> bool:
+        edit: Optional[Edit] = self.history.undo()
+        if edit is None:
+            return False
+        for op in reversed(edit.ops):
+            self._revert(op)
+        self._restore_selection(edit.selected_before)
+        return True
+
+    def redo(self) -> bool:
+        edit: Optional[Edit] = self.history.redo()
+        if edit is None:
+            return False
+        for op in edit.ops:
+            self._replay(op)
+        self._restore_selection(edit.selected_after)
+        return True
+
+    def get_atom_at(self, x: int, y: int) -> Optional[Atom]:
+        atom_id = self.atom_index.get((x, y))
+        if atom_id is None:
+            return None
+        return self.atoms[atom_id]
+
+    def get_bond_count(self, atom: Atom) -> int:
+        return atom.used_valence
+
+    def remaining_bonds(self, atom: Atom) -> int:
+        max_val = MAX_VALENCY.get(atom.element, 4)
+        return max_val - self.get_bond_count(atom)
+
+    def add_atom(self, element: str, x: int, y: int) -> Optional[Atom]:
+        if (x, y) in self.locked_positions:
+            return None
+        self.history.begin(self.selected_atom_id)
+        existing = self.get_atom_at(x, y)
+        if existing:
+            for bond_id in list(existing.bonds):
+                self.remove_bond(bond_id)
+            self._detach_atom(existing)
+        atom = Atom(element=element, x=x, y=y)
+        self._attach_atom(atom)
+        self.history.commit(self.selected_atom_id)
+        return atom
+
+    def delete_atom(self, x: int, y: int) -> None:
+        if (x, y) in self.locked_positions:
+            return
+        existing = self.get_atom_at(x, y)
+        if not existing:
+            return
+        self.history.begin(self.selected_atom_id)
+        for bond_id in list(existing.bonds):
+            self.remove_bond(bond_id)
+        self._detach_atom(existing)
+        self.history.commit(self.selected_atom_id)
+
+    def remove_bond(self, bond_id: int) -> None:
+        if bond_id in self.bonds:
+            self._detach_bond(self.bonds[bond_id])
+
+    def toggle_select(self, x: int, y: int) -> bool:
+        self._changed(self.selection_rows() + (y,))
+        atom = self.get_atom_at(x, y)
+        if not atom:
+            self.selected_atom_id = None
+            return False
+        if self.selected_atom_id is None:
+            self.selected_atom_id = atom.id
+            return False
+        if self.selected_atom_id == atom.id:
+            self.selected_atom_id = None
+            return False
+        selected = self.atoms.get(self.selected_atom_id)
+        bonded = False
+        if selected:
+            self.history.begin(self.selected_atom_id)
+            bonded = self.create_bond(selected, atom)
+            self.history.commit(None)
+        self.selected_atom_id = None
+        return bonded
+
+    def get_existing_bond(self, a: Atom, b: Atom) -> Optional[Bond]:
+        bond_id = self._bond_index.get(frozenset((a.id, b.id)))
+        if bond_id is None:
+            return None
+        return self.bonds[bond_id]
+
+    def can_add_bond(self, atom: Atom, order: int = 1) -> bool:
+        return self.remaining_bonds(atom) >= order
+
+    def create_bond(self, source: Atom, target: Atom) -> bool:
+        existing = self.get_existing_bond(source, target)
+        if existing:
+            if self.can_add_bond(source, 1) and self.can_add_bond(target, 1):
+                self._set_bond_order(existing, existing.order + 1)
+                if existing.order > 3:
+                    self.remove_bond(existing.id)
+                return True
+            return False
+        if source.x != target.x and source.y != target.y:
+            return False
+        if not self.can_add_bond(source, 1) or not self.can_add_bond(target, 1):
+            return False
+        orientation = "V" if source.x == target.x else "H"
+        bond = Bond(atom_a_id=source.id, atom_b_id=target.id, orientation=orientation)
+        self._attach_bond(bond)
+        return True
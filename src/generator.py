@@ -0,0 +1,271 @@
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .catalogue import write_pack
+from .engine import GRID_HEIGHT, GRID_WIDTH, MAX_VALENCY
+from .molecule_graph import folded_graph_hash
+from .puzzles import Difficulty, Puzzle, puzzle_to_record
+
+LATTICE = 4
+STUB = 2
+LATTICE_COLS = (GRID_WIDTH - 1 - 2 * STUB) // LATTICE + 1
+LATTICE_ROWS = (GRID_HEIGHT - 1 - 2 * STUB) // LATTICE + 1
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+HEAVY_ELEMENTS = ("C", "O", "N", "Cl")
+HEAVY_WEIGHTS = (12, 4, 3, 1)
+
+
+def hill_formula(counts: Dict[str, int]) -> str:
+    order = [e for e in ("C", "H") if e in counts] if "C" in counts else []
+    order += sorted(e for e in counts if e not in order)
+    return "".join(f"{e}{counts[e] if counts[e] > 1 else ''}" for e in order)
+
+
+def difficulty_for(atom_count: int, bond_units: int) -> Difficulty:
+    weight = atom_count + bond_units
+    if weight <= 16:
+        return Difficulty.EASY
+    if weight <= 26:
+        return Difficulty.MEDIUM
+    return Difficulty.HARD
+
+
+def time_limit_for(atom_count: int) -> int:
+    return min(180, 30 + 5 * atom_count)
+
+
+Layout = Tuple[List[str], List[Tuple[int, int]], List[List[int]], List[Tuple[int, int, int]], str]
+
+
+class MoleculeGenerator:
+    SATURATION = 200
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        min_heavy: int = 1,
+        max_heavy: int = 8,
+        multiple_bond_chance: float = 0.25,
+    ) -> None:
+        self.rng = random.Random(seed)
+        self.min_heavy = min_heavy
+        self.max_heavy = max_heavy
+        self.multiple_bond_chance = multiple_bond_chance
+
+    def generate(self) -> Puzzle:
+        while True:
+            layout = self._try_layout(self.rng.randint(self.min_heavy, self.max_heavy))
+            if layout is not None:
+                return self._build_puzzle(*layout)
+
+    def generate_batch(self, count: int, max_attempts: Optional[int] = None) -> List[Puzzle]:
+        puzzles: List[Puzzle] = []
+        seen = set()
+        sizes = list(range(self.min_heavy, self.max_heavy + 1))
+        misses = dict.fromkeys(sizes, 0)
+        attempts = 0
+        limit = max_attempts if max_attempts is not None else count * 50
+        while len(puzzles) < count and attempts < limit and sizes:
+            attempts += 1
+            size = self.rng.choice(sizes)
+            layout = self._try_layout(size)
+            if layout is None or layout[-1] in seen:
+                misses[size] += 1
+                if misses[size] >= self.SATURATION:
+                    sizes.remove(size)
+                continue
+            misses[size] = 0
+            seen.add(layout[-1])
+            puzzles.append(self._build_puzzle(*layout))
+        return puzzles
+
+    def _try_layout(self, heavy_count: int) -> Optional[Layout]:
+        rng = self.rng
+        elements = rng.choices(HEAVY_ELEMENTS, HEAVY_WEIGHTS, k=heavy_count)
+        if heavy_count > 1 and elements[0] == "Cl":
+            elements[0] = "C"
+        start = (rng.randrange(LATTICE_COLS), rng.randrange(LATTICE_ROWS))
+        lattice: List[Tuple[int, int]] = [start]
+        occupied = {start}
+        used = [0] * heavy_count
+        bonds: List[List[int]] = []
+        open_dirs: List[List[Tuple[int, int]]] = [list(DIRECTIONS)]
+
+        for child in range(1, heavy_count):
+            parents = [k for k in range(child) if used[k] < MAX_VALENCY[elements[k]] and open_dirs[k]]
+            placed = False
+            while parents and not placed:
+                parent = parents.pop(rng.randrange(len(parents)))
+                px, py = lattice[parent]
+                dirs = open_dirs[parent]
+                rng.shuffle(dirs)
+                for dx, dy in dirs:
+                    cell = (px + dx, py + dy)
+                    if cell in occupied or not (0 <= cell[0] < LATTICE_COLS and 0 <= cell[1] < LATTICE_ROWS):
+                        continue
+                    dirs.remove((dx, dy))
+                    lattice.append(cell)
+                    occupied.add(cell)
+                    open_dirs.append([d for d in DIRECTIONS if d != (-dx, -dy)])
+                    used[parent] += 1
+                    used[child] += 1
+                    bonds.append([parent, child, 1])
+                    placed = True
+                    break
+            if not placed:
+                return None
+
+        for bond in bonds:
+            if rng.random() >= self.multiple_bond_chance:
+                continue
+            a, b = bond[0], bond[1]
+            spare = min(MAX_VALENCY[elements[a]] - used[a], MAX_VALENCY[elements[b]] - used[b], 2)
+            if spare > 0:
+                extra = rng.randint(1, spare)
+                bond[2] += extra
+                used[a] += extra
+                used[b] += extra
+
+        positions = [(STUB + LATTICE * i, STUB + LATTICE * j) for i, j in lattice]
+        taken = set(positions)
+        for a, b, _ in bonds:
+            (ax, ay), (bx, by) = positions[a], positions[b]
+            if ax == bx:
+                taken.update((ax, y) for y in range(min(ay, by) + 1, max(ay, by)))
+            else:
+                taken.update((x, ay) for x in range(min(ax, bx) + 1, max(ax, bx)))
+
+        hydrogens: List[Tuple[int, int, int]] = []
+        counts: Dict[int, int] = {}
+        for k in range(heavy_count):
+            need = MAX_VALENCY[elements[k]] - used[k]
+            if not need:
+                continue
+            counts[k] = need
+            x, y = positions[k]
+            dirs = open_dirs[k]
+            rng.shuffle(dirs)
+            for dx, dy in dirs:
+                hx, hy = x + dx * STUB, y + dy * STUB
+                path = (x + dx, y + dy)
+                if (hx, hy) in taken or path in taken:
+                    continue
+                taken.add((hx, hy))
+                taken.add(path)
+                hydrogens.append((k, hx, hy))
+                need -= 1
+                if not need:
+                    break
+            if need:
+                return None
+
+        neighbours: Dict[int, List[Tuple[int, int]]] = {k: [] for k in range(heavy_count)}
+        for a, b, order in bonds:
+            neighbours[a].append((order, b))
+            neighbours[b].append((order, a))
+        target_hash = folded_graph_hash(dict(enumerate(elements)), counts, neighbours)
+        return elements, positions, bonds, hydrogens, target_hash
+
+    def _build_puzzle(
+        self,
+        elements: List[str],
+        positions: List[Tuple[int, int]],
+        bonds: List[List[int]],
+        hydrogens: List[Tuple[int, int, int]],
+        target_hash: str,
+    ) -> Puzzle:
+        counts: Dict[str, int] = {}
+        for elem in elements:
+            counts[elem] = counts.get(elem, 0) + 1
+        if hydrogens:
+            counts["H"] = len(hydrogens)
+
+        carbons = [pos for pos, elem in zip(positions, elements) if elem == "C"]
+        target_atoms = [(elem, x, y) for (x, y), elem in zip(positions, elements) if elem != "C"]
+        target_atoms += [("H", x, y) for _, x, y in hydrogens]
+        target_bonds = [(positions[a], positions[b], order) for a, b, order in bonds]
+        target_bonds += [(positions[parent], (x, y), 1) for parent, x, y in hydrogens]
+
+        atom_count = len(elements) + len(hydrogens)
+        bond_units = sum(order for _, _, order in bonds) + len(hydrogens)
+        formula = hill_formula(counts)
+        puzzle = Puzzle(
+            name=f"{formula} #{target_hash[:6]}",
+            formula=formula,
+            difficulty=difficulty_for(atom_count, bond_units),
+            carbons=carbons,
+            target_atoms=target_atoms,
+            target_bonds=target_bonds,
+            hint=f"{atom_count} atoms, {len(target_bonds)} bonds",
+            time_limit=time_limit_for(atom_count),
+        )
+        puzzle.target_hash = target_hash
+        return puzzle
+
+
+def _generate_chunk(job: Tuple[int, int, int, int]) -> List[Puzzle]:
+    seed, count, min_heavy, max_heavy = job
+    return MoleculeGenerator(seed, min_heavy, max_heavy).generate_batch(count)
+
+
+def generate_pack(
+    count: int,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    min_heavy: int = 1,
+    max_heavy: int = 8,
+) -> List[Puzzle]:
+    if workers <= 1:
+        return MoleculeGenerator(seed, min_heavy, max_heavy).generate_batch(count)
+    seeds = random.Random(seed)
+    puzzles: List[Puzzle] = []
+    seen = set()
+    with ProcessPoolExecutor(workers) as pool:
+        for _ in range(10):
+            missing = count - len(puzzles)
+            if missing <= 0:
+                break
+            share = -(-missing // workers)
+            jobs = [(seeds.getrandbits(64), share, min_heavy, max_heavy) for _ in range(workers)]
+            for chunk in pool.map(_generate_chunk, jobs):
+                for puzzle in chunk:
+                    if puzzle.target_hash not in seen and len(puzzles) < count:
+                        seen.add(puzzle.target_hash)
+                        puzzles.append(puzzle)
+    return puzzles
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.generator", description="Generate a deduplicated puzzle pack.")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--min-heavy", type=int, default=1)
+    parser.add_argument("--max-heavy", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", type=Path, default=None, help="directory to write <difficulty>.json packs into")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    puzzles = generate_pack(args.count, args.seed, args.workers, args.min_heavy, args.max_heavy)
+    elapsed = time.perf_counter() - start
+    rate = len(puzzles) / elapsed if elapsed else float("inf")
+    print(f"{len(puzzles)} unique puzzles in {elapsed:.2f}s ({rate:,.0f}/s)")
+
+    if args.out is not None:
+        args.out.mkdir(parents=True, exist_ok=True)
+        for difficulty in Difficulty:
+            records = [puzzle_to_record(p) for p in puzzles if p.difficulty == difficulty]
+            write_pack(difficulty.value, records, args.out)
+            print(f"{difficulty.value}: {len(records)} puzzles -> {args.out / (difficulty.value + '.json')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
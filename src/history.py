@@ -0,0 +1,120 @@
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, List, Optional, Tuple, Union
+
+ATOM_ADD = "atom+"
+ATOM_REMOVE = "atom-"
+BOND_ADD = "bond+"
+BOND_REMOVE = "bond-"
+BOND_ORDER = "order"
+
+_CANCELS = {(ATOM_ADD, ATOM_REMOVE), (BOND_ADD, BOND_REMOVE)}
+
+
+@dataclass
+class Edit:
+    ops: List[tuple] = field(default_factory=list)
+    selected_before: Optional[int] = None
+    selected_after: Optional[int] = None
+    record: Optional[list] = field(default=None, repr=False, compare=False)
+
+
+def push_op(ops: List[tuple], op: tuple) -> None:
+    if ops and ops[-1][1] is op[1]:
+        last = ops[-1]
+        if (last[0], op[0]) in _CANCELS:
+            ops.pop()
+            return
+        if last[0] == BOND_ORDER and op[0] == BOND_ORDER:
+            ops.pop()
+            if last[2] != op[3]:
+                ops.append((BOND_ORDER, op[1], last[2], op[3]))
+            return
+        if last[0] == BOND_ADD and op[0] == BOND_ORDER:
+            ops[-1] = (BOND_ADD, op[1], op[3])
+            return
+        if last[0] == BOND_ORDER and op[0] == BOND_REMOVE:
+            ops.pop()
+            push_op(ops, (BOND_REMOVE, op[1], last[2]))
+            return
+    ops.append(op)
+
+
+Entry = Union[Edit, list]
+
+
+class EditHistory:
+    def __init__(self, max_depth: Optional[int] = None) -> None:
+        self._undo: Deque[Entry] = deque(maxlen=max_depth)
+        self._redo: List[Entry] = []
+        self._pending: Optional[Edit] = None
+        self._decode: Optional[Callable[[list], Edit]] = None
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def begin(self, selected: Optional[int]) -> None:
+        self._pending = Edit(selected_before=selected)
+
+    def record(self, op: tuple) -> None:
+        if self._pending is not None:
+            push_op(self._pending.ops, op)
+
+    def commit(self, selected: Optional[int]) -> None:
+        edit, self._pending = self._pending, None
+        if edit is None or not edit.ops:
+            return
+        edit.selected_after = selected
+        self._undo.append(edit)
+        self._redo.clear()
+
+    def undo(self) -> Optional[Edit]:
+        if not self._undo:
+            return None
+        edit = self._decoded(self._undo.pop())
+        self._redo.append(edit)
+        return edit
+
+    def redo(self) -> Optional[Edit]:
+        if not self._redo:
+            return None
+        edit = self._decoded(self._redo.pop())
+        self._undo.append(edit)
+        return edit
+
+    def _decoded(self, entry: Entry) -> Edit:
+        if isinstance(entry, Edit):
+            return entry
+        edit = self._decode(entry)
+        edit.record = entry
+        return edit
+
+    def entries(self) -> Tuple[List[Entry], List[Entry]]:
+        return list(self._undo), list(self._redo)
+
+    def load(self, undo: List[Entry], redo: List[Entry], decode: Optional[Callable[[list], Edit]] = None) -> None:
+        self._undo = deque(undo, maxlen=self._undo.maxlen)
+        self._redo = list(redo)
+        self._pending = None
+        self._decode = decode
+
+    def memory_bytes(self) -> int:
+        size = sys.getsizeof(self._undo) + sys.getsizeof(self._redo)
+        for edit in (*self._undo, *self._redo):
+            if not isinstance(edit, Edit):
+                size += sys.getsizeof(edit) + sum(sys.getsizeof(op) for op in edit[2:])
+                continue
+            size += sys.getsizeof(edit) + sys.getsizeof(edit.ops)
+            size += sum(sys.getsizeof(op) for op in edit.ops)
+        return size
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self._pending = None
+        self._decode = None
@@ -1,21 +1,43 @@
 from dataclasses import dataclass, field
-from typing import List
-import uuid
+from itertools import count
+from typing import List, Tuple
 
+_atom_ids = count(1)
+_bond_ids = count(1)
 
-@dataclass
+
+def _next_atom_id() -> int:
+    return next(_atom_ids)
+
+
+def _next_bond_id() -> int:
+    return next(_bond_ids)
+
+
+def id_watermark() -> Tuple[int, int]:
+    return _next_atom_id(), _next_bond_id()
+
+
+def reserve_ids(atom_id: int, bond_id: int) -> None:
+    global _atom_ids, _bond_ids
+    _atom_ids = count(max(_next_atom_id(), atom_id))
+    _bond_ids = count(max(_next_bond_id(), bond_id))
+
+
+@dataclass(slots=True)
 class Atom:
     element: str
     x: int
     y: int
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    bonds: List[str] = field(default_factory=list)
+    id: int = field(default_factory=_next_atom_id)
+    bonds: List[int] = field(default_factory=list)
+    used_valence: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Bond:
-    atom_a_id: str
-    atom_b_id: str
+    atom_a_id: int
+    atom_b_id: int
     order: int = 1
     orientation: str = "H"
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: int = field(default_factory=_next_bond_id)
@@ -0,0 +1,80 @@
+import hashlib
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+Edge = Tuple[Hashable, Hashable, int]
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _element_label(element: str) -> int:
+    return int(_digest(element), 16)
+
+
+def graph_hash(elements: Dict[Hashable, str], edges: Iterable[Edge]) -> str:
+    neighbours: Dict[Hashable, List[Tuple[int, Hashable]]] = {node: [] for node in elements}
+    for a, b, order in edges:
+        if a in neighbours and b in neighbours:
+            neighbours[a].append((order, b))
+            neighbours[b].append((order, a))
+    hydrogens: Counter = Counter()
+    for node, element in elements.items():
+        if element == "H" and len(neighbours[node]) == 1:
+            order, other = neighbours[node][0]
+            if order == 1 and elements[other] != "H":
+                hydrogens[other] += 1
+                del neighbours[node]
+    for node, links in neighbours.items():
+        if hydrogens[node]:
+            neighbours[node] = [(order, other) for order, other in links if other in neighbours]
+    return folded_graph_hash(elements, hydrogens, neighbours)
+
+
+def folded_graph_hash(
+    elements: Dict[Hashable, str],
+    hydrogens: Dict[Hashable, int],
+    neighbours: Dict[Hashable, List[Tuple[int, Hashable]]],
+) -> str:
+    labels = {node: hash((_element_label(elements[node]), hydrogens.get(node, 0))) for node in neighbours}
+    rounds = [tuple(sorted(labels.values()))]
+    distinct = len(set(rounds[0]))
+    for _ in range(len(labels)):
+        labels = {
+            node: hash((labels[node], tuple(sorted([(order, labels[other]) for order, other in links]))))
+            for node, links in neighbours.items()
+        }
+        rounds.append(tuple(sorted(labels.values())))
+        refined = len(set(rounds[-1]))
+        if refined == distinct:
+            break
+        distinct = refined
+    return _digest(repr(rounds))
+
+
+def puzzle_elements(puzzle) -> Dict[Tuple[int, int], str]:
+    elements = {(x, y): "C" for x, y in puzzle.carbons}
+    for elem, x, y in puzzle.target_atoms:
+        elements[(x, y)] = elem
+    return elements
+
+
+def puzzle_hash(puzzle) -> str:
+    edges = ((tuple(a), tuple(b), order) for a, b, order in puzzle.target_bonds)
+    return graph_hash(puzzle_elements(puzzle), edges)
+
+
+def board_hash(atoms: Iterable, bonds: Iterable) -> str:
+    elements = {atom.id: atom.element for atom in atoms}
+    return graph_hash(elements, ((bond.atom_a_id, bond.atom_b_id, bond.order) for bond in bonds))
+
+
+def element_counts(atoms: Iterable) -> Counter:
+    return Counter(atom.element for atom in atoms)
+
+
+def matches_puzzle(atoms: Iterable, bonds: Iterable, puzzle) -> bool:
+    return board_hash(atoms, bonds) == puzzle.target_hash
@@ -0,0 +1,63 @@
+import json
+import os
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Deque, Optional
+
+TRACE_ENV = "MOLECRAFT_TRACE"
+
+
+class FrameProfiler:
+    WINDOW = 120
+
+    def __init__(self, trace_path: Optional[Path] = None) -> None:
+        self.render_ms: Deque[float] = deque(maxlen=self.WINDOW)
+        self.frames = 0
+        self.pending: Counter = Counter()
+        self.peak_pending: Counter = Counter()
+        self.trace_path = trace_path
+        self._trace = None
+        if trace_path is not None:
+            trace_path.parent.mkdir(parents=True, exist_ok=True)
+            self._trace = trace_path.open("a", encoding="utf-8")
+
+    @classmethod
+    def from_env(cls) -> Optional["FrameProfiler"]:
+        path = os.environ.get(TRACE_ENV)
+        return cls(Path(path)) if path else None
+
+    def frame(self, elapsed: float, lines: int) -> None:
+        ms = elapsed * 1000
+        self.frames += 1
+        self.render_ms.append(ms)
+        self.trace("render", ms=round(ms, 4), lines=lines)
+
+    def posted(self, name: str) -> None:
+        self.pending[name] += 1
+        if self.pending[name] > self.peak_pending[name]:
+            self.peak_pending[name] = self.pending[name]
+
+    def handled(self, name: str) -> None:
+        if self.pending[name] > 0:
+            self.pending[name] -= 1
+
+    def trace(self, event: str, **fields) -> None:
+        if self._trace is not None:
+            self._trace.write(json.dumps({"t": round(time.time(), 6), "event": event, **fields}) + "\n")
+
+    def summary(self) -> dict:
+        samples = sorted(self.render_ms)
+        return {
+            "frames": self.frames,
+            "last_ms": self.render_ms[-1] if self.render_ms else 0.0,
+            "avg_ms": sum(samples) / len(samples) if samples else 0.0,
+            "p95_ms": samples[int(len(samples) * 0.95)] if samples else 0.0,
+            "pending": dict(self.pending),
+            "peak_pending": dict(self.peak_pending),
+        }
+
+    def close(self) -> None:
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
@@ -0,0 +1,262 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .engine import Board, step_cursor
+from .molecule_graph import matches_puzzle
+from .puzzles import Puzzle, find_puzzle
+
+REPLAY_VERSION = 1
+
+MOVE_UP = "U"
+MOVE_DOWN = "D"
+MOVE_LEFT = "L"
+MOVE_RIGHT = "R"
+ADD_H = "h"
+ADD_O = "o"
+ADD_N = "n"
+ADD_CL = "l"
+SELECT = "s"
+DELETE = "x"
+UNDO = "u"
+REDO = "y"
+RESET = "r"
+SUBMIT = "!"
+
+_MOVES = {MOVE_UP: (0, -1), MOVE_DOWN: (0, 1), MOVE_LEFT: (-1, 0), MOVE_RIGHT: (1, 0)}
+_ELEMENTS = {ADD_H: "H", ADD_O: "O", ADD_N: "N", ADD_CL: "Cl"}
+
+SOLVED = "solved"
+TIMEOUT = "timeout"
+QUIT = "quit"
+ABANDONED = "abandoned"
+
+
+def solve_points(time_left: int, streak: int) -> int:
+    return 100 + time_left * 10 + (streak - 1) * 25
+
+
+class ReplayRecorder:
+    def __init__(self, session: int, puzzle: Puzzle, cursor: Optional[Tuple[int, int]] = None) -> None:
+        self.session = session
+        self.puzzle = puzzle
+        self.cursor = cursor
+        self.events: list = []
+
+    @classmethod
+    def from_record(cls, record: dict, puzzle: Puzzle) -> "ReplayRecorder":
+        recorder = cls(record["session"], puzzle, tuple(record["cursor"]) if record.get("cursor") else None)
+        recorder.events = list(record["events"])
+        return recorder
+
+    def record(self, code: str, elapsed_ms: int, cursor: Tuple[int, int]) -> None:
+        if self.cursor is None:
+            self.cursor = cursor
+        self.events += (elapsed_ms, code)
+
+    def to_record(self, outcome: str) -> dict:
+        return {
+            "v": REPLAY_VERSION,
+            "session": self.session,
+            "puzzle": self.puzzle.name,
+            "difficulty": self.puzzle.difficulty.value,
+            "cursor": list(self.cursor) if self.cursor is not None else None,
+            "outcome": outcome,
+            "events": self.events,
+        }
+
+
+@dataclass
+class RunResult:
+    puzzle: str
+    session: Optional[int]
+    outcome: str
+    solved: bool = False
+    time_left: int = 0
+    failures: int = 0
+    undo_count: int = 0
+    actions: int = 0
+    errors: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def replay_run(record: dict) -> RunResult:
+    if not isinstance(record, dict):
+        return RunResult("?", None, "?", errors=[f"malformed replay: expected an object, got {type(record).__name__}"])
+    start = time.perf_counter()
+    result = RunResult(str(record.get("puzzle")), record.get("session"), str(record.get("outcome")))
+    try:
+        _replay_events(record, result)
+    except (KeyError, IndexError, TypeError, ValueError) as exc:
+        result.errors.append(f"malformed replay: {exc!r}")
+    result.elapsed_ms = (time.perf_counter() - start) * 1000
+    return result
+
+
+def _replay_events(record: dict, result: RunResult) -> None:
+    if record.get("v") != REPLAY_VERSION:
+        result.errors.append(f"unsupported replay version {record.get('v')!r}")
+        return
+    puzzle = find_puzzle(record["difficulty"], record["puzzle"])
+    if puzzle is None:
+        result.errors.append("unknown puzzle")
+        return
+    board = Board(puzzle)
+    x, y = record["cursor"] if record["cursor"] is not None else (0, 0)
+    cursor = (int(x), int(y))
+    limit_ms = puzzle.time_limit * 1000
+    events = record["events"]
+    last = 0
+    for i in range(0, len(events), 2):
+        at, code = events[i], events[i + 1]
+        if result.solved:
+            result.errors.append(f"{code!r} at {at}ms comes after the solving submit")
+            return
+        if not last <= at <= limit_ms:
+            result.errors.append(f"{code!r} at {at}ms is outside the puzzle clock")
+            return
+        last = at
+        result.actions += 1
+        if code in _MOVES:
+            cursor = step_cursor(cursor, *_MOVES[code])
+        elif code in _ELEMENTS:
+            board.add_atom(_ELEMENTS[code], *cursor)
+        elif code == SELECT:
+            board.toggle_select(*cursor)
+        elif code == DELETE:
+            board.delete_atom(*cursor)
+        elif code == UNDO:
+            result.undo_count += board.undo()
+        elif code == REDO:
+            board.redo()
+        elif code == RESET:
+            board.reset()
+            last = 0
+        elif code == SUBMIT:
+            if matches_puzzle(board.atoms.values(), board.bonds.values(), puzzle):
+                result.solved = True
+                result.time_left = -(-(limit_ms - at) // 1000)
+            else:
+                result.failures += 1
+        else:
+            result.errors.append(f"unknown action {code!r} at {at}ms")
+            return
+    if result.outcome == SOLVED and not result.solved:
+        result.errors.append("logged as solved but the moves do not build the molecule")
+    elif result.outcome != SOLVED and result.solved:
+        result.errors.append(f"logged as {result.outcome} but the moves solve the puzzle")
+
+
+@dataclass
+class SessionResult:
+    session: Optional[int]
+    lives: int
+    runs: List[RunResult] = field(default_factory=list)
+    score: int = 0
+    streak: int = 0
+    ended: bool = False
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors and all(run.ok for run in self.runs)
+
+
+def score_sessions(runs: Iterable[RunResult], lives: int = 3) -> List[SessionResult]:
+    sessions: Dict[Optional[int], SessionResult] = {}
+    for run in runs:
+        session = sessions.get(run.session)
+        if session is None:
+            session = sessions[run.session] = SessionResult(run.session, lives)
+        session.runs.append(run)
+        if session.ended:
+            session.errors.append(f"{run.puzzle} was played after the session ended")
+        elif not run.ok:
+            continue
+        elif run.solved:
+            session.streak += 1
+            session.score += solve_points(run.time_left, session.streak)
+        elif run.outcome == TIMEOUT:
+            session.streak = 0
+            session.lives -= 1
+            session.ended = session.lives <= 0
+        else:
+            session.ended = True
+    return list(sessions.values())
+
+
+def read_log(path: Path) -> List[dict]:
+    records = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def replay_all(records: List[dict], workers: int = 1) -> List[RunResult]:
+    if workers <= 1 or len(records) < 2:
+        return [replay_run(record) for record in records]
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(replay_run, records, chunksize=max(1, len(records) // (workers * 8))))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .save_manager import REPLAY_FILE, load_save
+
+    parser = argparse.ArgumentParser(prog="molecraft replay", description="Re-run recorded puzzles and check the scores.")
+    parser.add_argument("logs", nargs="*", type=Path, help=f"replay logs to check (default {REPLAY_FILE})")
+    parser.add_argument("--no-save", action="store_true", help="do not check the saved high score")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("-q", "--quiet", action="store_true", help="only list failing runs")
+    args = parser.parse_args(argv)
+
+    records: List[dict] = []
+    for path in args.logs or [REPLAY_FILE]:
+        if path.exists():
+            records += read_log(path)
+    start = time.perf_counter()
+    runs = replay_all(records, args.workers)
+    elapsed = time.perf_counter() - start
+    sessions = score_sessions(runs)
+
+    for run in runs:
+        if args.quiet and run.ok:
+            continue
+        status = "ok" if run.ok else "FAIL"
+        print(f"{status:<4} {run.elapsed_ms:7.2f}ms  {run.outcome:<9} {run.actions:4d} actions  {run.puzzle}")
+        for error in run.errors:
+            print(f"       error: {error}")
+    for session in sessions:
+        for error in session.errors:
+            print(f"FAIL session {session.session}: {error}")
+
+    failed = sum(not run.ok for run in runs) + sum(bool(session.errors) for session in sessions)
+    actions = sum(run.actions for run in runs)
+    print(f"{len(runs)} runs, {len(sessions)} sessions, {actions} actions, {failed} failed, {elapsed:.2f}s")
+
+    best = max((session.score for session in sessions if session.ok), default=0)
+    if not args.no_save:
+        claimed = load_save()["high_score"]
+        if claimed > best:
+            print(f"saved high score {claimed} is not backed by a replayed session (best {best})")
+            failed += 1
+        else:
+            print(f"saved high score {claimed} is backed by replayed sessions (best {best})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,27 @@
 import json
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
 from pathlib import Path
 from copy import deepcopy
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
-SAVE_DIR = Path.home() / ".molecraft"
+from .snapshot import SNAPSHOT_VERSION
+
+SAVE_DIR = Path(os.environ.get("MOLECRAFT_HOME") or Path.home() / ".molecraft")
 SAVE_FILE = SAVE_DIR / "save.json"
+JOURNAL_FILE = SAVE_DIR / "progress.jsonl"
+STATS_FILE = SAVE_DIR / "stats.db"
+RESUME_FILE = SAVE_DIR / "resume.json"
+REPLAY_FILE = SAVE_DIR / "replays.jsonl"
+
+SAVE_DEBOUNCE_SECONDS = 1.0
+SAVE_RETRY_MAX_SECONDS = 60.0
+COMPACT_EVERY = 256
 
 DEFAULT_SAVE = {
     "high_score": 0,
@@ -12,21 +30,385 @@ DEFAULT_SAVE = {
     "total_solved": 0,
     "best_streak": 0,
     "fastest_solve": None,
+    "reviews": {"easy": {}, "medium": {}, "hard": {}},
+    "review_clock": {"easy": 0, "medium": 0, "hard": 0},
+    "journal_seq": 0,
 }
 
 
-def load_save() -> dict:
+def apply_event(data: dict, event: dict) -> None:
+    kind = event["kind"]
+    if kind == "solve":
+        data["completed_puzzles"].setdefault(event["difficulty"], set()).add(event["puzzle"])
+        data["total_solved"] = data.get("total_solved", 0) + 1
+        fastest = data.get("fastest_solve")
+        if fastest is None or event["solve_time"] < fastest:
+            data["fastest_solve"] = event["solve_time"]
+        if event["streak"] > data.get("best_streak", 0):
+            data["best_streak"] = event["streak"]
+    elif kind == "review":
+        data["reviews"].setdefault(event["difficulty"], {})[event["puzzle"]] = event["state"]
+        data["review_clock"][event["difficulty"]] = event["clock"]
+    elif kind == "session":
+        data["high_score"] = max(data["high_score"], event["score"])
+        data["last_difficulty"] = event["difficulty"]
+    data["journal_seq"] = event["seq"]
+
+
+def _from_disk(data: dict) -> dict:
+    merged = deepcopy(DEFAULT_SAVE)
+    merged.update(data)
+    merged["completed_puzzles"] = {
+        key: set(names) for key, names in merged["completed_puzzles"].items()
+    }
+    return merged
+
+
+def _to_disk(data: dict) -> dict:
+    snapshot = dict(data)
+    snapshot["completed_puzzles"] = {
+        key: sorted(names) for key, names in data["completed_puzzles"].items()
+    }
+    snapshot["reviews"] = deepcopy(data["reviews"])
+    snapshot["review_clock"] = dict(data["review_clock"])
+    return snapshot
+
+
+def _read_journal() -> List[dict]:
+    events = []
+    try:
+        with JOURNAL_FILE.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(event, dict):
+                    events.append(event)
+    except FileNotFoundError:
+        pass
+    return events
+
+
+def read_save() -> Tuple[dict, int]:
+    data = deepcopy(DEFAULT_SAVE)
     if SAVE_FILE.exists():
         try:
-            data = json.loads(SAVE_FILE.read_text(encoding="utf-8"))
-            merged = deepcopy(DEFAULT_SAVE)
-            merged.update(data)
-            return merged
+            data.update(json.loads(SAVE_FILE.read_text(encoding="utf-8")))
         except (json.JSONDecodeError, KeyError):
-            return deepcopy(DEFAULT_SAVE)
-    return deepcopy(DEFAULT_SAVE)
+            data = deepcopy(DEFAULT_SAVE)
+    data = _from_disk(data)
+    events = _read_journal()
+    for event in events:
+        if event.get("seq", 0) > data["journal_seq"]:
+            try:
+                apply_event(data, event)
+            except (AttributeError, KeyError, TypeError):
+                continue
+    return data, len(events)
+
+
+def load_save() -> dict:
+    return read_save()[0]
+
+
+def _atomic_write(path: Path, payload: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def write_resume(state: dict) -> None:
+    _atomic_write(RESUME_FILE, json.dumps(state, separators=(",", ":")))
+
+
+def load_resume() -> Optional[dict]:
+    try:
+        state = json.loads(RESUME_FILE.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    board = state.get("board") if isinstance(state, dict) else None
+    if not isinstance(board, dict) or board.get("v") != SNAPSHOT_VERSION:
+        return None
+    return state
+
+
+def clear_resume() -> None:
+    try:
+        RESUME_FILE.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _append_lines(path: Path, payload: str, sync: bool = False) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab+") as handle:
+        if handle.tell():
+            handle.seek(-1, os.SEEK_END)
+            if handle.read(1) != b"\n":
+                payload = "\n" + payload
+        handle.write(payload.encode("utf-8"))
+        if sync:
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+def append_replay(record: dict) -> None:
+    _append_lines(REPLAY_FILE, json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def _append_journal(lines: List[str]) -> None:
+    _append_lines(JOURNAL_FILE, "".join(lines), sync=True)
+
+
+class SaveWriter:
+    def __init__(
+        self,
+        delay: float = SAVE_DEBOUNCE_SECONDS,
+        compact_every: int = COMPACT_EVERY,
+        backlog: int = 0,
+    ) -> None:
+        self.delay = delay
+        self.compact_every = compact_every
+        self._lines: List[str] = []
+        self._snapshot: Optional[dict] = None
+        self._since_compact = backlog
+        self._deadline = 0.0
+        self._failures = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="molecraft-save", daemon=True)
+        self._thread.start()
+
+    def record(self, data: dict, kind: str, **fields) -> None:
+        event = {"seq": data["journal_seq"] + 1, "kind": kind, **fields}
+        apply_event(data, event)
+        line = json.dumps(event, separators=(",", ":")) + "\n"
+        with self._cond:
+            self._lines.append(line)
+            self._since_compact += 1
+            if self._since_compact >= self.compact_every:
+                self._snapshot = _to_disk(data)
+                self._since_compact = 0
+            if not self._failures and (len(self._lines) == 1 or self._snapshot is not None):
+                self._deadline = time.monotonic() + self.delay
+            self._cond.notify()
+
+    def flush(self) -> None:
+        with self._io_lock:
+            with self._cond:
+                lines, self._lines = self._lines, []
+                snapshot, self._snapshot = self._snapshot, None
+            try:
+                if lines:
+                    _append_journal(lines)
+                if snapshot is not None:
+                    _atomic_write(SAVE_FILE, json.dumps(snapshot, indent=2))
+                    seq = snapshot["journal_seq"]
+                    newer = [line for line in lines if json.loads(line)["seq"] > seq]
+                    _atomic_write(JOURNAL_FILE, "".join(newer))
+            except Exception:
+                with self._cond:
+                    self._lines[:0] = lines
+                    if self._snapshot is None:
+                        self._snapshot = snapshot
+                    self._failures += 1
+                    backoff = min(self.delay * 2 ** self._failures, SAVE_RETRY_MAX_SECONDS)
+                    self._deadline = time.monotonic() + backoff
+            else:
+                self._failures = 0
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if not self._lines and self._snapshot is None:
+                        self._cond.wait()
+                        continue
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+            self.flush()
+
+
+STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    puzzle TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    played_at REAL NOT NULL,
+    solved INTEGER NOT NULL,
+    solve_time INTEGER NOT NULL,
+    undo_count INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS attempts_by_time ON attempts (puzzle, solve_time) WHERE solved = 1;
+CREATE INDEX IF NOT EXISTS attempts_by_date ON attempts (puzzle, played_at);
+
+CREATE TABLE IF NOT EXISTS puzzle_stats (
+    puzzle TEXT PRIMARY KEY,
+    difficulty TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    solves INTEGER NOT NULL,
+    best_time INTEGER,
+    total_solve_time INTEGER NOT NULL,
+    failures INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    attempts INTEGER NOT NULL,
+    solves INTEGER NOT NULL,
+    fastest INTEGER
+);
+
+CREATE TRIGGER IF NOT EXISTS attempts_aggregate AFTER INSERT ON attempts
+BEGIN
+    INSERT INTO puzzle_stats VALUES (
+        NEW.puzzle, NEW.difficulty, 1, NEW.solved,
+        CASE WHEN NEW.solved THEN NEW.solve_time END,
+        CASE WHEN NEW.solved THEN NEW.solve_time ELSE 0 END,
+        NEW.failures
+    )
+    ON CONFLICT (puzzle) DO UPDATE SET
+        attempts = attempts + 1,
+        solves = solves + NEW.solved,
+        best_time = CASE WHEN NEW.solved AND (best_time IS NULL OR NEW.solve_time < best_time)
+                         THEN NEW.solve_time ELSE best_time END,
+        total_solve_time = total_solve_time + CASE WHEN NEW.solved THEN NEW.solve_time ELSE 0 END,
+        failures = failures + NEW.failures;
+    INSERT OR IGNORE INTO totals VALUES (1, 0, 0, NULL);
+    UPDATE totals SET
+        attempts = attempts + 1,
+        solves = solves + NEW.solved,
+        fastest = CASE WHEN NEW.solved AND (fastest IS NULL OR NEW.solve_time < fastest)
+                       THEN NEW.solve_time ELSE fastest END
+    WHERE id = 1;
+END;
+"""
+
+
+@dataclass
+class Attempt:
+    puzzle: str
+    difficulty: str
+    played_at: float
+    solved: bool
+    solve_time: int
+    undo_count: int
+    failures: int
+
+
+@dataclass
+class PuzzleStats:
+    puzzle: str
+    difficulty: str
+    attempts: int
+    solves: int
+    best_time: Optional[int]
+    total_solve_time: int
+    failures: int
+
+    @property
+    def average_time(self) -> Optional[float]:
+        return self.total_solve_time / self.solves if self.solves else None
+
+
+class StatsStore:
+    def __init__(self, path: Path = STATS_FILE) -> None:
+        if str(path) != ":memory:":
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(STATS_SCHEMA)
+
+    def import_totals(self, data: dict) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO totals VALUES (1, ?, ?, ?)",
+                (data.get("total_solved", 0), data.get("total_solved", 0), data.get("fastest_solve")),
+            )
+
+    def record_attempt(
+        self,
+        puzzle: str,
+        difficulty: str,
+        solved: bool,
+        solve_time: int,
+        undo_count: int = 0,
+        failures: int = 0,
+    ) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO attempts (puzzle, difficulty, played_at, solved, solve_time, undo_count, failures)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (puzzle, difficulty, time.time(), int(solved), solve_time, undo_count, failures),
+            )
+
+    def summary(self) -> Dict[str, Optional[int]]:
+        row = self.conn.execute("SELECT attempts, solves, fastest FROM totals WHERE id = 1").fetchone()
+        attempts, solves, fastest = row if row else (0, 0, None)
+        return {"attempts": attempts, "solves": solves, "fastest": fastest}
+
+    def puzzle_stats(self, puzzle: str) -> Optional[PuzzleStats]:
+        row = self.conn.execute("SELECT * FROM puzzle_stats WHERE puzzle = ?", (puzzle,)).fetchone()
+        return PuzzleStats(*row) if row else None
+
+    def best_times(self, difficulty: str) -> Dict[str, int]:
+        rows = self.conn.execute(
+            "SELECT puzzle, best_time FROM puzzle_stats WHERE difficulty = ? AND best_time IS NOT NULL",
+            (difficulty,),
+        )
+        return dict(rows)
+
+    def percentile(self, puzzle: str, pct: float) -> Optional[int]:
+        stats = self.puzzle_stats(puzzle)
+        if stats is None or not stats.solves:
+            return None
+        rank = min(stats.solves, max(1, math.ceil(pct / 100 * stats.solves)))
+        row = self.conn.execute(
+            "SELECT solve_time FROM attempts WHERE puzzle = ? AND solved = 1"
+            " ORDER BY solve_time LIMIT 1 OFFSET ?",
+            (puzzle, rank - 1),
+        ).fetchone()
+        return row[0]
 
+    def history(self, puzzle: str, limit: int = 20) -> List[Attempt]:
+        rows = self.conn.execute(
+            "SELECT puzzle, difficulty, played_at, solved, solve_time, undo_count, failures FROM attempts"
+            " WHERE puzzle = ? ORDER BY played_at DESC LIMIT ?",
+            (puzzle, limit),
+        )
+        return [Attempt(p, d, at, bool(s), t, u, f) for p, d, at, s, t, u, f in rows]
 
-def write_save(data: dict) -> None:
-    SAVE_DIR.mkdir(parents=True, exist_ok=True)
-    SAVE_FILE.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,182 @@
+import heapq
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from .puzzles import Puzzle
+
+MIN_EASE = 1.3
+REVIEW_SPACING = 3
+PROMOTION_MASTERY = 0.8
+
+
+class Bag:
+    def __init__(self) -> None:
+        self._items: List[int] = []
+        self._slots: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: int) -> bool:
+        return item in self._slots
+
+    def add(self, item: int) -> None:
+        if item not in self._slots:
+            self._slots[item] = len(self._items)
+            self._items.append(item)
+
+    def discard(self, item: int) -> None:
+        slot = self._slots.pop(item, None)
+        if slot is None:
+            return
+        last = self._items.pop()
+        if last != item:
+            self._items[slot] = last
+            self._slots[last] = slot
+
+    def choice(self, rng: random.Random) -> int:
+        return self._items[rng.randrange(len(self._items))]
+
+
+@dataclass
+class ReviewState:
+    ease: float = 2.5
+    interval: int = 0
+    reps: int = 0
+    due: int = 0
+
+    def to_record(self) -> list:
+        return [round(self.ease, 3), self.interval, self.reps, self.due]
+
+
+def review_quality(solve_time: int, time_limit: int, failures: int = 0) -> int:
+    ratio = solve_time / time_limit if time_limit else 1.0
+    quality = 5 if ratio <= 1 / 3 else 4 if ratio <= 2 / 3 else 3
+    return max(3, quality - min(failures, 2))
+
+
+def sm2(state: ReviewState, quality: int, clock: int) -> ReviewState:
+    if quality < 3:
+        reps, interval = 0, 1
+    else:
+        reps = state.reps + 1
+        interval = 1 if reps == 1 else 6 if reps == 2 else round(state.interval * state.ease)
+    ease = max(MIN_EASE, state.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return ReviewState(ease, interval, reps, clock + interval * REVIEW_SPACING)
+
+
+class PuzzleScheduler:
+    def __init__(
+        self,
+        puzzles: List[Puzzle],
+        completed: Set[str],
+        reviews: Optional[Dict[str, list]] = None,
+        clock: int = 0,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.puzzles = puzzles
+        self.completed = completed
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self._index = {puzzle.name: i for i, puzzle in enumerate(puzzles)}
+        self._fresh = Bag()
+        self._replay = Bag()
+        self._session: Set[int] = set()
+        self._states: Dict[int, ReviewState] = {}
+        self._entries: Dict[int, Tuple[int, int]] = {}
+        self._heap: List[Tuple[int, int]] = []
+        self._mastered: Set[int] = set()
+        self._last: Optional[int] = None
+        for name, record in (reviews or {}).items():
+            i = self._index.get(name)
+            if i is not None:
+                self._schedule(i, ReviewState(*record))
+        for i, puzzle in enumerate(puzzles):
+            if i in self._states:
+                continue
+            if puzzle.name in completed:
+                self._replay.add(i)
+                self._mastered.add(i)
+            else:
+                self._fresh.add(i)
+
+    @property
+    def mastery(self) -> float:
+        return len(self._mastered) / len(self.puzzles) if self.puzzles else 1.0
+
+    def pick(self) -> Puzzle:
+        top = self._peek()
+        if top is not None and top[0] <= self.clock and top[1] != self._last:
+            choice = top[1]
+        elif self._fresh:
+            choice = self._fresh.choice(self.rng)
+        elif self._replay:
+            choice = self._replay.choice(self.rng)
+        elif top is not None and top[1] != self._last:
+            choice = top[1]
+        else:
+            self.reset_session()
+            entries = sorted(self._entries.values())
+            choice = next((i for _, i in entries if i != self._last), entries[0][1])
+        self._last = choice
+        return self.puzzles[choice]
+
+    def mark_solved(self, puzzle: Puzzle, solve_time: int, failures: int = 0) -> Optional[ReviewState]:
+        return self.review(puzzle, review_quality(solve_time, puzzle.time_limit, failures))
+
+    def mark_failed(self, puzzle: Puzzle) -> Optional[ReviewState]:
+        return self.review(puzzle, 1)
+
+    def review(self, puzzle: Puzzle, quality: int) -> Optional[ReviewState]:
+        i = self._index.get(puzzle.name)
+        if i is None:
+            return None
+        self.clock += 1
+        state = sm2(self._states.get(i, ReviewState()), quality, self.clock)
+        self._fresh.discard(i)
+        self._replay.discard(i)
+        if state.reps:
+            self._session.add(i)
+            self._entries.pop(i, None)
+            self._set_state(i, state)
+        else:
+            self._session.discard(i)
+            self._schedule(i, state)
+        return state
+
+    def session_names(self) -> List[str]:
+        return [self.puzzles[i].name for i in self._session]
+
+    def restore_session(self, names: List[str]) -> None:
+        for name in names:
+            i = self._index.get(name)
+            if i is not None and i in self._states and self._states[i].reps:
+                self._session.add(i)
+                self._entries.pop(i, None)
+
+    def reset_session(self) -> None:
+        for i in self._session:
+            self._schedule(i, self._states[i])
+        self._session.clear()
+
+    def _set_state(self, i: int, state: ReviewState) -> None:
+        self._states[i] = state
+        if state.reps:
+            self._mastered.add(i)
+        else:
+            self._mastered.discard(i)
+
+    def _schedule(self, i: int, state: ReviewState) -> None:
+        self._set_state(i, state)
+        entry = self._entries[i] = (state.due, i)
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self._entries) + 16:
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
+
+    def _peek(self) -> Optional[Tuple[int, int]]:
+        heap = self._heap
+        while heap and self._entries.get(heap[0][1]) is not heap[0]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
@@ -1,12 +1,20 @@
+import time
+from typing import Optional
+
 from textual.screen import Screen
 from textual.widgets import Static, Button, Footer
 from textual.containers import Container, Horizontal, Vertical
 from textual.binding import Binding
 from textual.app import ComposeResult
-from textual.timer import Timer
 
 from ..widgets.puzzle_grid import PuzzleGrid
+from ..profiler import FrameProfiler
 from ..puzzles import Puzzle
+from ..replay import (
+    ADD_CL, ADD_H, ADD_N, ADD_O, DELETE, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT, MOVE_UP, QUIT, REDO, RESET, SELECT, SUBMIT,
+    UNDO, ReplayRecorder,
+)
+from ..snapshot import SnapshotError, dump_board, load_board
 from .pause import PauseModal
 
 
@@ -75,6 +83,18 @@ class GameScreen(Screen):
     .action-btn {
         margin: 0 2;
     }
+    #debug-overlay {
+        display: none;
+        dock: right;
+        width: 36;
+        height: auto;
+        background: $panel;
+        border: round $accent;
+        padding: 0 1;
+    }
+    #debug-overlay.-visible {
+        display: block;
+    }
     """
 
     BINDINGS = [
@@ -91,16 +111,25 @@ class GameScreen(Screen):
         Binding("backspace", "delete", "Del", show=False),
         Binding("enter", "submit", "Submit"),
         Binding("u", "undo", "Undo"),
+        Binding("y", "redo", "Redo"),
         Binding("r", "reset", "Reset"),
+        Binding("v", "toggle_valence", "Valence"),
         Binding("p", "pause", "Pause"),
+        Binding("d", "toggle_debug", "Debug", show=False),
         Binding("escape", "back", "Back"),
     ]
 
-    def __init__(self, puzzle: Puzzle) -> None:
+    def __init__(self, puzzle: Puzzle, state: Optional[dict] = None) -> None:
         super().__init__()
         self.puzzle = puzzle
-        self.time_left = puzzle.time_limit
-        self.timer: Timer | None = None
+        self._pending_state = state
+        self.deadline: Optional[float] = None
+        self.frozen_left: float = puzzle.time_limit
+        self._shown_left: Optional[int] = None
+        self.undo_count = 0
+        self.failures = 0
+        self._status_key: Optional[tuple] = None
+        self.recorder: Optional[ReplayRecorder] = None
 
     def _lives_display(self) -> str:
         return f"[bold red]{'♥ ' * self.app.lives}{'♡ ' * (self.app.STARTING_LIVES - self.app.lives)}[/]"
@@ -110,9 +139,12 @@ class GameScreen(Screen):
             return f"[bold bright_yellow]x{self.app.streak}[/]"
         return ""
 
+    def _title_display(self) -> str:
+        return f"[bold]{self.puzzle.name}[/] ({self.puzzle.formula}) | Score: {self.app.score}"
+
     def compose(self) -> ComposeResult:
         with Horizontal(id="header-bar"):
-            yield Static(f"[bold]{self.puzzle.name}[/] ({self.puzzle.formula}) | Score: {self.app.score}", id="puzzle-name")
+            yield Static(self._title_display(), id="puzzle-name")
             yield Static(self._streak_display(), id="streak-display")
             yield Static(self._lives_display(), id="lives")
             yield Static(f"⏱ {self.time_left:02d}s", id="timer")
@@ -127,106 +159,248 @@ class GameScreen(Screen):
                 yield Static("  │  ", id="sep")
                 yield Button("Submit", id="submit-btn", classes="action-btn", variant="success")
                 yield Button("Reset", id="reset-btn", classes="action-btn", variant="warning")
-            yield Static("[dim]Arrows: move | H/O/N/L: atom | Space: bond | U: undo | Enter: submit | P: pause[/]", id="bond-info")
+            yield Static("[dim]Arrows: move | H/O/N/L: atom | Space: bond | U/Y: undo/redo | Enter: submit | P: pause[/]", id="bond-info")
+        yield Static(id="debug-overlay")
         yield Footer()
 
     def on_mount(self) -> None:
         self.grid = self.query_one(PuzzleGrid)
         self.grid.focus()
-        self.timer = self.set_interval(1, self.tick)
+        self.start_clock(self.puzzle.time_limit)
+        self.recorder = ReplayRecorder(self.app.session_id, self.puzzle)
+        self.grid.profiler = self.app.profiler
+        self.debug_timer = self.set_interval(0.5, self.update_debug, pause=self.app.profiler is None)
+        if self._pending_state is not None:
+            self.restore(self._pending_state)
+            self._pending_state = None
+        self.update_status()
+
+    def load_puzzle(self, puzzle: Puzzle, state: Optional[dict] = None) -> None:
+        self.puzzle = puzzle
+        self.undo_count = 0
+        self.failures = 0
+        self._status_key = None
+        self.grid.load_puzzle(puzzle)
+        self.query_one("#puzzle-name", Static).update(self._title_display())
+        self.query_one("#streak-display", Static).update(self._streak_display())
+        self.query_one("#lives", Static).update(self._lives_display())
+        self.start_clock(puzzle.time_limit)
+        self.recorder = ReplayRecorder(self.app.session_id, puzzle)
+        if state is not None:
+            self.restore(state)
         self.update_status()
+        self.grid.focus()
+
+    def snapshot(self) -> dict:
+        return {
+            "puzzle": self.puzzle.name,
+            "difficulty": self.puzzle.difficulty.value,
+            "time_left": self.remaining_ms / 1000,
+            "undo_count": self.undo_count,
+            "failures": self.failures,
+            "board": dump_board(self.grid.board, self.grid.cursor),
+            "replay": self.recorder.to_record(QUIT),
+        }
+
+    def restore(self, state: dict) -> None:
+        try:
+            cursor = load_board(self.grid.board, state["board"])
+        except SnapshotError:
+            self.grid.reset()
+            self.notify("The saved board could not be restored", severity="warning")
+            return
+        self.grid.cursor = cursor
+        if "replay" in state:
+            self.recorder = ReplayRecorder.from_record(state["replay"], self.puzzle)
+        self.undo_count = state.get("undo_count", 0)
+        self.failures = state.get("failures", 0)
+        self._status_key = None
+        self.start_clock(state.get("time_left", self.puzzle.time_limit))
+
+    @property
+    def remaining_ms(self) -> int:
+        remaining = self.frozen_left if self.deadline is None else self.deadline - time.monotonic()
+        return max(0, round(remaining * 1000))
+
+    @property
+    def time_left(self) -> int:
+        return -(-self.remaining_ms // 1000)
+
+    def _record(self, code: str) -> None:
+        self.recorder.record(code, self.puzzle.time_limit * 1000 - self.remaining_ms, self.grid.cursor)
+
+    def start_clock(self, seconds: float) -> None:
+        self.frozen_left = seconds
+        self.deadline = time.monotonic() + seconds
+        self.tick()
+
+    def pause_clock(self) -> None:
+        if self.deadline is not None:
+            self.frozen_left = max(0.0, self.deadline - time.monotonic())
+            self.deadline = None
+
+    def resume_clock(self) -> None:
+        if self.deadline is None and self.frozen_left > 0:
+            self.deadline = time.monotonic() + self.frozen_left
 
     def tick(self) -> None:
-        self.time_left -= 1
-        self.query_one("#timer", Static).update(f"⏱ {self.time_left:02d}s")
-        if self.time_left <= 10:
-            self.query_one("#timer", Static).update(f"[bold red]⏱ {self.time_left:02d}s[/]")
-        if self.time_left <= 0:
-            self.timer.stop()
+        left = self.time_left
+        if left != self._shown_left:
+            self._shown_left = left
+            if left <= 10:
+                self.query_one("#timer", Static).update(f"[bold red]⏱ {left:02d}s[/]")
+            else:
+                self.query_one("#timer", Static).update(f"⏱ {left:02d}s")
+        if left <= 0 and self.deadline is not None:
+            self.pause_clock()
             self.app.lose_life("Time's up!")
 
     def update_status(self) -> None:
-        atom = self.grid.get_atom_at(self.grid.cursor_x, self.grid.cursor_y)
+        board = self.grid.board
+        key = (self.grid.cursor, board.revision)
+        if key == self._status_key:
+            return
+        self._status_key = key
+        atom = board.get_atom_at(*self.grid.cursor)
         if atom:
-            rem = self.grid.remaining_bonds(atom)
+            rem = board.remaining_bonds(atom)
             info = f"{atom.element}: {rem} bonds left"
         else:
             info = "Empty cell"
         self.sub_title = info
 
+    def update_debug(self) -> None:
+        profiler = self.grid.profiler
+        if profiler is None:
+            return
+        stats = profiler.summary()
+        undo_bytes = self.grid.undo_memory()
+        profiler.trace("sample", undo_bytes=undo_bytes, pending=stats["pending"])
+        overlay = self.query_one("#debug-overlay", Static)
+        if not overlay.has_class("-visible"):
+            return
+        queue = "\n".join(
+            f"  {name}: {stats['pending'].get(name, 0)} (peak {peak})"
+            for name, peak in sorted(stats["peak_pending"].items())
+        )
+        overlay.update(
+            f"[bold]Debug[/]\n"
+            f"Render  {stats['last_ms']:.2f}ms  avg {stats['avg_ms']:.2f}  p95 {stats['p95_ms']:.2f}\n"
+            f"Frames  {stats['frames']}\n"
+            f"Queue\n{queue or '  empty'}\n"
+            f"Undo    {undo_bytes / 1024:.1f} KiB\n"
+            f"Trace   {profiler.trace_path or 'off'}"
+        )
+
+    def _handled(self, event) -> None:
+        if self.grid.profiler is not None:
+            self.grid.profiler.handled(type(event).__name__)
+
     def on_puzzle_grid_cursor_moved(self, event: PuzzleGrid.CursorMoved) -> None:
+        self._handled(event)
         self.update_status()
 
     def on_puzzle_grid_atom_placed(self, event: PuzzleGrid.AtomPlaced) -> None:
+        self._handled(event)
         self.update_status()
 
     def on_puzzle_grid_bond_created(self, event: PuzzleGrid.BondCreated) -> None:
+        self._handled(event)
         self.update_status()
 
     def action_move_up(self) -> None:
+        self._record(MOVE_UP)
         self.grid.move_cursor(0, -1)
 
     def action_move_down(self) -> None:
+        self._record(MOVE_DOWN)
         self.grid.move_cursor(0, 1)
 
     def action_move_left(self) -> None:
+        self._record(MOVE_LEFT)
         self.grid.move_cursor(-1, 0)
 
     def action_move_right(self) -> None:
+        self._record(MOVE_RIGHT)
         self.grid.move_cursor(1, 0)
 
     def action_add_h(self) -> None:
+        self._record(ADD_H)
         self.grid.add_atom("H")
 
     def action_add_o(self) -> None:
+        self._record(ADD_O)
         self.grid.add_atom("O")
 
     def action_add_n(self) -> None:
+        self._record(ADD_N)
         self.grid.add_atom("N")
 
     def action_add_cl(self) -> None:
+        self._record(ADD_CL)
         self.grid.add_atom("Cl")
 
     def action_toggle_select(self) -> None:
+        self._record(SELECT)
         self.grid.toggle_select()
 
     def action_delete(self) -> None:
+        self._record(DELETE)
         self.grid.delete_atom()
 
     def action_submit(self) -> None:
+        self.pause_clock()
+        self._record(SUBMIT)
         self.app.check_solution(self.grid)
+        self.resume_clock()
 
     def action_undo(self) -> None:
+        self._record(UNDO)
         if not self.grid.undo():
             self.notify("Nothing to undo", severity="warning")
+        else:
+            self.undo_count += 1
+            self.update_status()
+
+    def action_redo(self) -> None:
+        self._record(REDO)
+        if not self.grid.redo():
+            self.notify("Nothing to redo", severity="warning")
         else:
             self.update_status()
 
     def action_reset(self) -> None:
-        self.grid.atoms.clear()
-        self.grid.bonds.clear()
-        self.grid.locked_positions.clear()
-        self.grid.selected_atom_id = None
-        self.grid._setup_puzzle()
-        self.grid.refresh()
-        self.time_left = self.puzzle.time_limit
-        self.query_one("#timer", Static).update(f"⏱ {self.time_left:02d}s")
+        self._record(RESET)
+        self.grid.reset()
+        self.start_clock(self.puzzle.time_limit)
         self.notify("Puzzle reset")
 
+    def action_toggle_valence(self) -> None:
+        self.grid.toggle_open_valence()
+
+    def action_toggle_debug(self) -> None:
+        overlay = self.query_one("#debug-overlay", Static)
+        overlay.toggle_class("-visible")
+        if overlay.has_class("-visible"):
+            if self.app.profiler is None:
+                self.app.profiler = FrameProfiler()
+            self.grid.profiler = self.app.profiler
+            self.debug_timer.resume()
+            self.update_debug()
+        elif self.app.profiler.trace_path is None:
+            self.debug_timer.pause()
+
     def action_pause(self) -> None:
-        if self.timer:
-            self.timer.stop()
+        self.pause_clock()
         self.app.push_screen(PauseModal(), callback=self._on_resume)
 
     def _on_resume(self, result=None) -> None:
         if self.is_current:
-            self.timer = self.set_interval(1, self.tick)
+            self.resume_clock()
             self.grid.focus()
 
     def action_back(self) -> None:
-        if self.timer:
-            self.timer.stop()
-        self.app.return_to_menu()
+        self.app.quit_puzzle()
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         btn_id = event.button.id
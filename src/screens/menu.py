@@ -54,6 +54,11 @@ class MenuScreen(Screen):
     #hard-btn {
         background: red;
     }
+    #resume-row {
+        align: center middle;
+        width: 100%;
+        height: auto;
+    }
     #info {
         text-align: center;
         margin-top: 2;
@@ -70,14 +75,15 @@ class MenuScreen(Screen):
         Binding("1", "start_easy", "Easy"),
         Binding("2", "start_medium", "Medium"),
         Binding("3", "start_hard", "Hard"),
+        Binding("r", "resume", "Resume"),
         Binding("q", "quit", "Quit"),
     ]
 
     def compose(self) -> ComposeResult:
-        save = self.app.save_data
-        high = save.get("high_score", 0)
-        solved = save.get("total_solved", 0)
-        fastest = save.get("fastest_solve")
+        high = self.app.save_data.get("high_score", 0)
+        totals = self.app.stats.summary()
+        solved = totals["solves"]
+        fastest = totals["fastest"]
         fastest_str = f"{fastest}s" if fastest is not None else "-"
 
         with Container(id="menu-container"):
@@ -90,7 +96,13 @@ class MenuScreen(Screen):
                 yield Button("1. Easy", id="easy-btn", classes="difficulty-btn")
                 yield Button("2. Medium", id="medium-btn", classes="difficulty-btn")
                 yield Button("3. Hard", id="hard-btn", classes="difficulty-btn")
-            yield Static("[dim]Press 1, 2, 3 to select difficulty | Q to quit[/]", id="info")
+            resume = self.app.resume_data
+            keys = "Press 1, 2, 3 to select difficulty"
+            if resume is not None:
+                with Horizontal(id="resume-row"):
+                    yield Button(f"R. Resume {resume.get('puzzle', '')}", id="resume-btn", variant="primary")
+                keys += " | R to resume"
+            yield Static(f"[dim]{keys} | Q to quit[/]", id="info")
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "easy-btn":
@@ -99,6 +111,8 @@ class MenuScreen(Screen):
             self.start_game(Difficulty.MEDIUM)
         elif event.button.id == "hard-btn":
             self.start_game(Difficulty.HARD)
+        elif event.button.id == "resume-btn":
+            self.action_resume()
 
     def action_start_easy(self) -> None:
         self.start_game(Difficulty.EASY)
@@ -109,6 +123,10 @@ class MenuScreen(Screen):
     def action_start_hard(self) -> None:
         self.start_game(Difficulty.HARD)
 
+    def action_resume(self) -> None:
+        if self.app.resume_data is not None:
+            self.app.resume_puzzle()
+
     def start_game(self, difficulty: Difficulty) -> None:
         self.app.start_puzzle(difficulty)
 
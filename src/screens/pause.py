@@ -56,7 +56,7 @@ class PauseModal(ModalScreen):
             self.action_resume()
         elif event.button.id == "menu-btn":
             self.dismiss()
-            self.app.return_to_menu()
+            self.app.quit_puzzle()
 
     def action_resume(self) -> None:
         self.dismiss()
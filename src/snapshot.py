@@ -0,0 +1,91 @@
+import json
+from typing import Dict, List
+
+from .engine import Board, Cell
+from .history import ATOM_ADD, ATOM_REMOVE, BOND_ADD, BOND_ORDER, BOND_REMOVE, Edit
+from .models import Atom, Bond, id_watermark, reserve_ids
+
+SNAPSHOT_VERSION = 1
+
+_OP_CODES = {ATOM_ADD: 0, ATOM_REMOVE: 1, BOND_ADD: 2, BOND_REMOVE: 3, BOND_ORDER: 4}
+_OP_KINDS = [ATOM_ADD, ATOM_REMOVE, BOND_ADD, BOND_REMOVE, BOND_ORDER]
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def encode_edit(edit: Edit) -> list:
+    if edit.record is None:
+        record: list = [edit.selected_before, edit.selected_after]
+        for kind, target, *rest in edit.ops:
+            code = _OP_CODES[kind]
+            if code < 2:
+                record.append([code, target.id, target.element, target.x, target.y])
+            else:
+                record.append([code, target.id, target.atom_a_id, target.atom_b_id, target.orientation, *rest])
+        edit.record = record
+    return edit.record
+
+
+def dump_board(board: Board, cursor: Cell) -> dict:
+    undo, redo = board.history.entries()
+    atoms: List = []
+    for atom in board.atoms.values():
+        atoms += (atom.id, atom.element, atom.x, atom.y)
+    bonds: List = []
+    for bond in board.bonds.values():
+        bonds += (bond.id, bond.atom_a_id, bond.atom_b_id, bond.order, bond.orientation)
+    return {
+        "v": SNAPSHOT_VERSION,
+        "ids": list(id_watermark()),
+        "atoms": atoms,
+        "bonds": bonds,
+        "undo": [entry if isinstance(entry, list) else encode_edit(entry) for entry in undo],
+        "redo": [entry if isinstance(entry, list) else encode_edit(entry) for entry in redo],
+        "selected": board.selected_atom_id,
+        "cursor": list(cursor),
+    }
+
+
+def load_board(board: Board, data: dict) -> Cell:
+    if data.get("v") != SNAPSHOT_VERSION:
+        raise SnapshotError(f"unsupported snapshot version {data.get('v')!r}")
+    try:
+        reserve_ids(*data["ids"])
+        table = data["atoms"]
+        atoms = [Atom(table[i + 1], table[i + 2], table[i + 3], table[i]) for i in range(0, len(table), 4)]
+        table = data["bonds"]
+        bonds = [Bond(*table[i + 1:i + 5], table[i]) for i in range(0, len(table), 5)]
+        known_atoms: Dict[int, Atom] = {atom.id: atom for atom in atoms}
+        known_bonds: Dict[int, Bond] = {bond.id: bond for bond in bonds}
+        if len(known_atoms) != len(atoms) or len(known_bonds) != len(bonds):
+            raise SnapshotError("snapshot repeats an atom or bond id")
+
+        def decode(record: list) -> Edit:
+            ops = []
+            for op in record[2:]:
+                code, target = op[0], op[1]
+                if code < 2:
+                    atom = known_atoms.get(target)
+                    if atom is None:
+                        atom = known_atoms[target] = Atom(op[2], op[3], op[4], target)
+                    ops.append((_OP_KINDS[code], atom))
+                    continue
+                bond = known_bonds.get(target)
+                if bond is None:
+                    bond = known_bonds[target] = Bond(op[2], op[3], op[5], op[4], target)
+                ops.append((_OP_KINDS[code], bond, *op[5:]))
+            return Edit(ops, record[0], record[1])
+
+        board.load_state(atoms, bonds, data["undo"], data["redo"], decode, data["selected"])
+        x, y = data["cursor"]
+        return int(x), int(y)
+    except SnapshotError:
+        raise
+    except (IndexError, KeyError, TypeError, ValueError) as exc:
+        raise SnapshotError(f"corrupt snapshot: {exc}") from None
+
+
+def dumps(data: dict) -> str:
+    return json.dumps(data, separators=(",", ":"))
@@ -0,0 +1,205 @@
+import argparse
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .catalogue import check_record, pack_path, read_pack
+from .molecule_graph import matches_puzzle, puzzle_elements
+from .puzzles import Difficulty, MOLECULE_FACTS, Puzzle, puzzle_from_record
+from .engine import GRID_HEIGHT, GRID_WIDTH, MAX_VALENCY, Board
+
+_FORMULA_TOKEN = re.compile(r"([A-Z][a-z]?)(\d*)")
+
+
+@dataclass
+class PuzzleReport:
+    difficulty: str
+    name: str
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def parse_formula(formula: str) -> Counter:
+    counts: Counter = Counter()
+    position = 0
+    for match in _FORMULA_TOKEN.finditer(formula):
+        if match.start() != position:
+            break
+        counts[match.group(1)] += int(match.group(2) or 1)
+        position = match.end()
+    if position != len(formula):
+        raise ValueError(f"cannot parse formula {formula!r}")
+    return counts
+
+
+def _format_counts(counts: Counter) -> str:
+    return "".join(f"{e}{n if n > 1 else ''}" for e, n in sorted(counts.items()))
+
+
+def _bond_path(a: Tuple[int, int], b: Tuple[int, int]) -> List[Tuple[int, int]]:
+    (ax, ay), (bx, by) = a, b
+    if ax == bx:
+        return [(ax, y) for y in range(min(ay, by) + 1, max(ay, by))]
+    return [(x, ay) for x in range(min(ax, bx) + 1, max(ax, bx))]
+
+
+def check_chemistry(puzzle: Puzzle) -> List[str]:
+    errors: List[str] = []
+    elements = puzzle_elements(puzzle)
+    if len(elements) != len(puzzle.carbons) + len(puzzle.target_atoms):
+        errors.append("two target atoms share a cell")
+    for x, y in elements:
+        if not (0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT):
+            errors.append(f"atom at {(x, y)} is off the grid")
+
+    used: Dict[Tuple[int, int], int] = dict.fromkeys(elements, 0)
+    path_owner: Dict[Tuple[int, int], Tuple] = {}
+    pairs = set()
+    for a, b, order in puzzle.target_bonds:
+        a, b = tuple(a), tuple(b)
+        pair = frozenset((a, b))
+        if a == b:
+            errors.append(f"bond {a}-{b} joins an atom to itself")
+            continue
+        if pair in pairs:
+            errors.append(f"bond {a}-{b} is listed twice")
+        pairs.add(pair)
+        if a[0] != b[0] and a[1] != b[1]:
+            errors.append(f"bond {a}-{b} is not orthogonal")
+            continue
+        for cell in _bond_path(a, b):
+            if cell in elements:
+                errors.append(f"bond {a}-{b} passes through the atom at {cell}")
+            elif cell in path_owner:
+                errors.append(f"bond {a}-{b} overlaps bond {path_owner[cell][0]}-{path_owner[cell][1]} at {cell}")
+            else:
+                path_owner[cell] = (a, b)
+        if a in used and b in used:
+            used[a] += order
+            used[b] += order
+
+    for pos, element in elements.items():
+        valency = MAX_VALENCY.get(element)
+        if valency is None:
+            errors.append(f"unknown element {element} at {pos}")
+        elif used[pos] != valency:
+            errors.append(f"{element} at {pos} has {used[pos]} bonds, expected {valency}")
+
+    try:
+        formula = parse_formula(puzzle.formula)
+    except ValueError as exc:
+        errors.append(str(exc))
+    else:
+        if formula != puzzle.element_counts:
+            errors.append(
+                f"formula {puzzle.formula} needs {_format_counts(formula)} "
+                f"but the target has {_format_counts(puzzle.element_counts)}"
+            )
+    return errors
+
+
+def solve_headless(puzzle: Puzzle) -> Optional[str]:
+    board = Board(puzzle)
+    for element, x, y in puzzle.target_atoms:
+        board.add_atom(element, x, y)
+        atom = board.get_atom_at(x, y)
+        if atom is None or atom.element != element:
+            return f"could not place {element} at {(x, y)}"
+    for a, b, order in puzzle.target_bonds:
+        for _ in range(order):
+            board.toggle_select(*a)
+            board.toggle_select(*b)
+        source, target = board.get_atom_at(*a), board.get_atom_at(*b)
+        bond = board.get_existing_bond(source, target) if source and target else None
+        if bond is None or bond.order != order:
+            return f"could not build the order-{order} bond {tuple(a)}-{tuple(b)}"
+    if not matches_puzzle(board.atoms.values(), board.bonds.values(), puzzle):
+        return "the built board does not match the target molecule"
+    return None
+
+
+def validate_puzzle(puzzle: Puzzle) -> PuzzleReport:
+    start = time.perf_counter()
+    report = PuzzleReport(puzzle.difficulty.value, puzzle.name)
+    report.errors.extend(check_chemistry(puzzle))
+    failure = solve_headless(puzzle)
+    if failure:
+        report.errors.append(f"not solvable in game: {failure}")
+    if puzzle.name not in MOLECULE_FACTS:
+        report.warnings.append("no entry in MOLECULE_FACTS")
+    report.elapsed_ms = (time.perf_counter() - start) * 1000
+    return report
+
+
+def _record_errors(record) -> List[str]:
+    if not isinstance(record, dict):
+        return ["record is not an object"]
+    try:
+        return check_record(record)
+    except (TypeError, ValueError) as exc:
+        return [f"malformed record: {exc}"]
+
+
+def load_targets(pack_dir: Optional[Path]) -> Tuple[List[Puzzle], List[PuzzleReport]]:
+    puzzles: List[Puzzle] = []
+    rejected: List[PuzzleReport] = []
+    for difficulty in Difficulty:
+        if pack_dir is None:
+            records = read_pack(difficulty.value)
+        elif pack_path(difficulty.value, pack_dir).exists():
+            records = read_pack(difficulty.value, pack_dir)
+        else:
+            continue
+        for i, record in enumerate(records):
+            errors = _record_errors(record)
+            if errors:
+                name = record.get("name") if isinstance(record, dict) else None
+                rejected.append(PuzzleReport(difficulty.value, str(name or f"record {i + 1}"), errors))
+            else:
+                puzzles.append(puzzle_from_record(record, difficulty))
+    return puzzles, rejected
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="molecraft validate", description="Check every puzzle in the catalogue.")
+    parser.add_argument("--packs", type=Path, default=None, help="validate the packs in this directory instead")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("-q", "--quiet", action="store_true", help="only list failing puzzles")
+    args = parser.parse_args(argv)
+
+    puzzles, reports = load_targets(args.packs)
+    start = time.perf_counter()
+    if args.workers > 1:
+        with ProcessPoolExecutor(args.workers) as pool:
+            reports += pool.map(validate_puzzle, puzzles, chunksize=max(1, len(puzzles) // (args.workers * 8)))
+    else:
+        reports += [validate_puzzle(puzzle) for puzzle in puzzles]
+    elapsed = time.perf_counter() - start
+
+    for report in reports:
+        if args.quiet and report.ok:
+            continue
+        status = "ok" if report.ok else "FAIL"
+        print(f"{status:<4} {report.elapsed_ms:7.2f}ms  {report.difficulty:<6} {report.name}")
+        for error in report.errors:
+            print(f"       error: {error}")
+        for warning in report.warnings:
+            print(f"       warning: {warning}")
+    failed = sum(not report.ok for report in reports)
+    print(f"{len(reports)} puzzles, {failed} failed, {elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,54 @@
-from typing import Dict, Optional
-from copy import deepcopy
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from textual.widgets import Static
+from textual.scroll_view import ScrollView
+from textual.geometry import Region, Size
 from textual.reactive import reactive
 from textual.message import Message
-from rich.text import Text
+from textual.strip import Strip
+from rich.segment import Segment
+from rich.style import Style
 
-from ..models import Atom, Bond
+from ..engine import BOND_CHARS, GRID_HEIGHT, GRID_WIDTH, MAX_VALENCY, Board, step_cursor
+from ..profiler import FrameProfiler
 from ..puzzles import Puzzle
 
+ATOM_STATE_STYLES = {
+    "normal": "{color}",
+    "locked": "bold {color}",
+    "cursor": "bold {color} reverse",
+    "selected": "bold {color} on dark_green",
+    "open": "bold {color} underline on grey23",
+}
 
-class PuzzleGrid(Static):
-    GRID_WIDTH = 60
-    GRID_HEIGHT = 16
+BOND_STYLE = Style.parse("cyan")
+HINT_STYLE = Style.parse("dim bright_black")
+HINT_CURSOR_STYLE = Style.parse("dim bright_magenta reverse")
+CURSOR_SEGMENT = Segment("◊", Style.parse("bold bright_magenta"))
+EMPTY_SEGMENT = Segment("·", Style.parse("bright_black"))
 
-    cursor_x: reactive[int] = reactive(30)
-    cursor_y: reactive[int] = reactive(8)
+
+def atom_segment_table(colors: Dict[str, str]) -> Dict[Tuple[str, str], Segment]:
+    return {
+        (element, state): Segment(element[0], Style.parse(template.format(color=color)))
+        for element, color in colors.items()
+        for state, template in ATOM_STATE_STYLES.items()
+    }
+
+
+def hint_segment_table(elements: Iterable[str]) -> Dict[Tuple[str, bool], Segment]:
+    table = {}
+    for element in elements:
+        table[(element, False)] = Segment(element[0].lower(), HINT_STYLE)
+        table[(element, True)] = Segment(element[0].lower(), HINT_CURSOR_STYLE)
+    return table
+
+
+class PuzzleGrid(ScrollView, can_focus=True, inherit_bindings=False):
+    GRID_WIDTH = GRID_WIDTH
+    GRID_HEIGHT = GRID_HEIGHT
+
+    cursor: reactive[Tuple[int, int]] = reactive((30, 8))
 
     ELEMENT_COLORS = {
         "C": "bright_white",
@@ -25,13 +58,7 @@ class PuzzleGrid(Static):
         "Cl": "bright_green",
     }
 
-    MAX_VALENCY = {
-        "C": 4,
-        "N": 3,
-        "O": 2,
-        "H": 1,
-        "Cl": 1,
-    }
+    MAX_VALENCY = MAX_VALENCY
 
     class CursorMoved(Message):
         def __init__(self, x: int, y: int) -> None:
@@ -45,228 +72,201 @@ class PuzzleGrid(Static):
     class BondCreated(Message):
         pass
 
-    MAX_UNDO = 50
+    BOND_CHARS = BOND_CHARS
+
+    ATOM_SEGMENTS = atom_segment_table(ELEMENT_COLORS)
+    HINT_SEGMENTS = hint_segment_table(ELEMENT_COLORS)
+    BOND_SEGMENTS = {glyph: Segment(glyph, BOND_STYLE) for pair in BOND_CHARS.values() for glyph in pair}
+
+    MAX_UNDO: Optional[int] = None
 
     def __init__(self, puzzle: Puzzle) -> None:
         super().__init__()
         self.can_focus = True
-        self.puzzle = puzzle
-        self.atoms: Dict[str, Atom] = {}
-        self.bonds: Dict[str, Bond] = {}
-        self.selected_atom_id: Optional[str] = None
+        self.board = Board(puzzle, self.MAX_UNDO, self._invalidate_rows)
         self.current_element = "H"
-        self.locked_positions: set = set()
-        self.hint_positions: Dict[tuple, str] = {}
         self.show_hints = True
-        self._undo_stack: list = []
-        self._setup_puzzle()
-
-    def _setup_puzzle(self) -> None:
-        self.hint_positions.clear()
-        for x, y in self.puzzle.carbons:
-            atom = Atom(element="C", x=x, y=y)
-            self.atoms[atom.id] = atom
-            self.locked_positions.add((x, y))
-        for elem, x, y in self.puzzle.target_atoms:
-            if elem == "C":
-                continue
-            self.hint_positions[(x, y)] = elem
-
-    def _push_undo(self) -> None:
-        snapshot = (deepcopy(self.atoms), deepcopy(self.bonds), self.selected_atom_id)
-        self._undo_stack.append(snapshot)
-        if len(self._undo_stack) > self.MAX_UNDO:
-            self._undo_stack.pop(0)
+        self.show_open_valence = False
+        self._row_versions: List[int] = [0] * self.GRID_HEIGHT
+        self._row_strips: Dict[int, Tuple[int, Strip]] = {}
+        self._line_cache: Dict[int, Tuple[tuple, Strip]] = {}
+        self.virtual_size = Size(self.GRID_WIDTH, self.GRID_HEIGHT)
+        self.profiler: Optional[FrameProfiler] = None
+        self._cursor_pending = False
 
-    def undo(self) -> bool:
-        if not self._undo_stack:
-            return False
-        self.atoms, self.bonds, self.selected_atom_id = self._undo_stack.pop()
-        self.refresh()
-        return True
+    @property
+    def puzzle(self) -> Puzzle:
+        return self.board.puzzle
 
-    def on_mount(self) -> None:
-        if self.puzzle.carbons:
-            self.cursor_x = self.puzzle.carbons[0][0]
-            self.cursor_y = self.puzzle.carbons[0][1]
+    @property
+    def cursor_x(self) -> int:
+        return self.cursor[0]
+
+    @cursor_x.setter
+    def cursor_x(self, x: int) -> None:
+        self.cursor = (x, self.cursor[1])
+
+    @property
+    def cursor_y(self) -> int:
+        return self.cursor[1]
+
+    @cursor_y.setter
+    def cursor_y(self, y: int) -> None:
+        self.cursor = (self.cursor[0], y)
+
+    def _invalidate_rows(self, rows: Iterable[int]) -> None:
+        for y in set(rows):
+            if 0 <= y < self.GRID_HEIGHT:
+                self._row_versions[y] += 1
+                self.refresh_lines(y)
+
+    def _invalidate_all(self) -> None:
+        for y in range(self.GRID_HEIGHT):
+            self._row_versions[y] += 1
         self.refresh()
 
-    def get_atom_at(self, x: int, y: int) -> Optional[Atom]:
-        for atom in self.atoms.values():
-            if atom.x == x and atom.y == y:
-                return atom
-        return None
+    def toggle_open_valence(self) -> None:
+        self.show_open_valence = not self.show_open_valence
+        self._invalidate_rows(self.board.atoms[atom_id].y for atom_id in self.board.open_atoms)
+
+    def _post(self, message: Message) -> None:
+        if self.profiler is not None:
+            self.profiler.posted(type(message).__name__)
+        self.post_message(message)
+
+    def undo_memory(self) -> int:
+        return self.board.history.memory_bytes()
 
-    def get_bond_count(self, atom: Atom) -> int:
-        total = 0
-        for bond_id in atom.bonds:
-            if bond_id in self.bonds:
-                total += self.bonds[bond_id].order
-        return total
+    def reset(self) -> None:
+        self.board.reset()
 
-    def remaining_bonds(self, atom: Atom) -> int:
-        max_val = self.MAX_VALENCY.get(atom.element, 4)
-        return max_val - self.get_bond_count(atom)
+    def load_puzzle(self, puzzle: Puzzle) -> None:
+        self.board.load_puzzle(puzzle)
+        if puzzle.carbons:
+            self.cursor = tuple(puzzle.carbons[0])
+
+    def undo(self) -> bool:
+        return self.board.undo()
+
+    def redo(self) -> bool:
+        return self.board.redo()
+
+    def on_mount(self) -> None:
+        if self.puzzle.carbons:
+            self.cursor = tuple(self.puzzle.carbons[0])
+        self._invalidate_all()
 
     def add_atom(self, element: str) -> None:
-        if (self.cursor_x, self.cursor_y) in self.locked_positions:
-            return
-        self._push_undo()
-        existing = self.get_atom_at(self.cursor_x, self.cursor_y)
-        if existing:
-            if (existing.x, existing.y) in self.locked_positions:
-                return
-            for bond_id in list(existing.bonds):
-                self.remove_bond(bond_id)
-            self.atoms.pop(existing.id)
-        atom = Atom(element=element, x=self.cursor_x, y=self.cursor_y)
-        self.atoms[atom.id] = atom
-        self.post_message(self.AtomPlaced())
-        self.refresh()
+        if self.board.add_atom(element, *self.cursor) is not None:
+            self._post(self.AtomPlaced())
 
     def delete_atom(self) -> None:
-        if (self.cursor_x, self.cursor_y) in self.locked_positions:
-            return
-        existing = self.get_atom_at(self.cursor_x, self.cursor_y)
-        if not existing:
-            return
-        self._push_undo()
-        for bond_id in list(existing.bonds):
-            self.remove_bond(bond_id)
-        self.atoms.pop(existing.id)
-        self.refresh()
-
-    def remove_bond(self, bond_id: str) -> None:
-        if bond_id in self.bonds:
-            bond = self.bonds[bond_id]
-            if bond.atom_a_id in self.atoms:
-                a = self.atoms[bond.atom_a_id]
-                if bond_id in a.bonds:
-                    a.bonds.remove(bond_id)
-            if bond.atom_b_id in self.atoms:
-                b = self.atoms[bond.atom_b_id]
-                if bond_id in b.bonds:
-                    b.bonds.remove(bond_id)
-            del self.bonds[bond_id]
+        self.board.delete_atom(*self.cursor)
 
     def toggle_select(self) -> None:
-        atom = self.get_atom_at(self.cursor_x, self.cursor_y)
-        if not atom:
-            self.selected_atom_id = None
-            self.refresh()
-            return
-        if self.selected_atom_id is None:
-            self.selected_atom_id = atom.id
-            self.refresh()
-            return
-        if self.selected_atom_id == atom.id:
-            self.selected_atom_id = None
-            self.refresh()
-            return
-        selected = self.atoms.get(self.selected_atom_id)
-        if selected:
-            self._push_undo()
-            self.create_bond(selected, atom)
-        self.selected_atom_id = None
-        self.refresh()
-
-    def get_existing_bond(self, a: Atom, b: Atom) -> Optional[Bond]:
-        for bond in self.bonds.values():
-            if (bond.atom_a_id == a.id and bond.atom_b_id == b.id) or \
-               (bond.atom_a_id == b.id and bond.atom_b_id == a.id):
-                return bond
-        return None
-
-    def can_add_bond(self, atom: Atom, order: int = 1) -> bool:
-        return self.remaining_bonds(atom) >= order
-
-    def create_bond(self, source: Atom, target: Atom) -> None:
-        existing = self.get_existing_bond(source, target)
-        if existing:
-            if self.can_add_bond(source, 1) and self.can_add_bond(target, 1):
-                existing.order += 1
-                if existing.order > 3:
-                    self.remove_bond(existing.id)
-                self.post_message(self.BondCreated())
-            return
-        if source.x != target.x and source.y != target.y:
-            return
-        if not self.can_add_bond(source, 1) or not self.can_add_bond(target, 1):
-            return
-        orientation = "V" if source.x == target.x else "H"
-        bond = Bond(atom_a_id=source.id, atom_b_id=target.id, orientation=orientation)
-        self.bonds[bond.id] = bond
-        source.bonds.append(bond.id)
-        target.bonds.append(bond.id)
-        self.post_message(self.BondCreated())
+        if self.board.toggle_select(*self.cursor):
+            self._post(self.BondCreated())
 
     def get_bond_cells(self) -> Dict[tuple, str]:
-        cells: Dict[tuple, str] = {}
-        for bond in self.bonds.values():
-            a = self.atoms.get(bond.atom_a_id)
-            b = self.atoms.get(bond.atom_b_id)
-            if not a or not b:
-                continue
-            chars = {1: ("─", "│"), 2: ("═", "║"), 3: ("≡", "┃")}
-            h_char, v_char = chars.get(bond.order, ("─", "│"))
-            if bond.orientation == "H":
-                x1, x2 = min(a.x, b.x), max(a.x, b.x)
-                for x in range(x1 + 1, x2):
-                    cells[(x, a.y)] = h_char
-            else:
-                y1, y2 = min(a.y, b.y), max(a.y, b.y)
-                for y in range(y1 + 1, y2):
-                    cells[(a.x, y)] = v_char
-        return cells
-
-    def render(self) -> Text:
-        bond_cells = self.get_bond_cells()
-        text = Text()
-        for y in range(self.GRID_HEIGHT):
-            for x in range(self.GRID_WIDTH):
-                atom = self.get_atom_at(x, y)
-                is_cursor = x == self.cursor_x and y == self.cursor_y
-                is_selected = self.selected_atom_id and atom and atom.id == self.selected_atom_id
-                is_locked = (x, y) in self.locked_positions
-                hint_elem = self.hint_positions.get((x, y))
-                if atom:
-                    ch = atom.element[0]
-                    color = self.ELEMENT_COLORS.get(atom.element, "white")
-                    if is_selected:
-                        text.append(ch, style=f"bold {color} on dark_green")
-                    elif is_cursor:
-                        text.append(ch, style=f"bold {color} reverse")
-                    elif is_locked:
-                        text.append(ch, style=f"bold {color}")
-                    else:
-                        text.append(ch, style=color)
-                elif (x, y) in bond_cells:
-                    text.append(bond_cells[(x, y)], style="cyan")
-                elif self.show_hints and hint_elem:
-                    ch = hint_elem[0].lower()
-                    if is_cursor:
-                        text.append(ch, style="dim bright_magenta reverse")
-                    else:
-                        text.append(ch, style="dim bright_black")
-                elif is_cursor:
-                    text.append("◊", style="bold bright_magenta")
+        return self.board.bond_cells
+
+    def _atom_segment(self, element: str, state: str) -> Segment:
+        segment = self.ATOM_SEGMENTS.get((element, state))
+        if segment is None:
+            segment = atom_segment_table({element: self.ELEMENT_COLORS.get(element, "white")})[(element, state)]
+            self.ATOM_SEGMENTS[(element, state)] = segment
+        return segment
+
+    def _hint_segment(self, element: str, is_cursor: bool) -> Segment:
+        segment = self.HINT_SEGMENTS.get((element, is_cursor))
+        if segment is None:
+            self.HINT_SEGMENTS.update(hint_segment_table((element,)))
+            segment = self.HINT_SEGMENTS[(element, is_cursor)]
+        return segment
+
+    def _render_row(self, y: int, bond_cells: Dict[tuple, str]) -> List[Segment]:
+        segments: List[Segment] = []
+        append = segments.append
+        board = self.board
+        atoms = board.atoms
+        atom_index = board.atom_index
+        locked = board.locked_positions
+        hints = board.hint_positions if self.show_hints else {}
+        open_atoms = board.open_atoms if self.show_open_valence else ()
+        bond_segments = self.BOND_SEGMENTS
+        cursor = self.cursor
+        selected = board.selected_atom_id
+        for x in range(self.GRID_WIDTH):
+            cell = (x, y)
+            atom_id = atom_index.get(cell)
+            if atom_id is not None:
+                if atom_id == selected:
+                    state = "selected"
+                elif cell == cursor:
+                    state = "cursor"
+                elif atom_id in open_atoms:
+                    state = "open"
+                elif cell in locked:
+                    state = "locked"
                 else:
-                    text.append("·", style="bright_black")
-            text.append("\n")
-        return text
+                    state = "normal"
+                append(self._atom_segment(atoms[atom_id].element, state))
+            elif cell in bond_cells:
+                append(bond_segments[bond_cells[cell]])
+            elif cell in hints:
+                append(self._hint_segment(hints[cell], cell == cursor))
+            elif cell == cursor:
+                append(CURSOR_SEGMENT)
+            else:
+                append(EMPTY_SEGMENT)
+        return segments
 
-    def watch_cursor_x(self) -> None:
-        self.refresh()
-        self.post_message(self.CursorMoved(self.cursor_x, self.cursor_y))
+    def _row_strip(self, y: int) -> Strip:
+        version = self._row_versions[y]
+        cached = self._row_strips.get(y)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        strip = Strip(self._render_row(y, self.board.bond_cells), self.GRID_WIDTH).simplify()
+        self._row_strips[y] = (version, strip)
+        return strip
 
-    def watch_cursor_y(self) -> None:
-        self.refresh()
-        self.post_message(self.CursorMoved(self.cursor_x, self.cursor_y))
+    def render_lines(self, crop: Region) -> List[Strip]:
+        if self.profiler is None:
+            return super().render_lines(crop)
+        start = time.perf_counter()
+        lines = super().render_lines(crop)
+        self.profiler.frame(time.perf_counter() - start, len(lines))
+        return lines
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        row = y + scroll_y
+        width = self.size.width
+        base_style = self.rich_style
+        if not 0 <= row < self.GRID_HEIGHT:
+            return Strip.blank(width, base_style)
+        key = (row, self._row_versions[row], scroll_x, width, base_style)
+        cached = self._line_cache.get(y)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        strip = (
+            self._row_strip(row)
+            .crop(scroll_x, scroll_x + width)
+            .apply_style(base_style)
+            .extend_cell_length(width, base_style)
+        )
+        self._line_cache[y] = (key, strip)
+        return strip
+
+    def watch_cursor(self, old: Tuple[int, int], new: Tuple[int, int]) -> None:
+        self._invalidate_rows((old[1], new[1]))
+        if not self._cursor_pending:
+            self._cursor_pending = True
+            self.call_after_refresh(self._flush_cursor)
+
+    def _flush_cursor(self) -> None:
+        self._cursor_pending = False
+        self._post(self.CursorMoved(self.cursor_x, self.cursor_y))
 
     def move_cursor(self, dx: int, dy: int) -> None:
-        new_x = self.cursor_x + dx
-        new_y = self.cursor_y + dy
-        if 0 <= new_x < self.GRID_WIDTH:
-            self.cursor_x = new_x
-        if 0 <= new_y < self.GRID_HEIGHT:
-            self.cursor_y = new_y
+        self.cursor = step_cursor(self.cursor, dx, dy)